@@ -0,0 +1,203 @@
+import time
+import threading
+import traceback
+from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from codebase import Dependency
+
+
+class AcquisitionResult:
+
+    def __init__(self,
+                 name: str,
+                 preparation_duration: float,
+                 build_duration: float,
+                 dependency: Dependency | None = None,
+                 error: str | None = None) -> None:
+
+        self._name: str = name
+        self._preparation_duration: float = preparation_duration
+        self._build_duration: float = build_duration
+        self._dependency: Dependency | None = dependency
+        self._error: str | None = error
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def preparation_duration(self) -> float:
+        return self._preparation_duration
+
+    @property
+    def build_duration(self) -> float:
+        return self._build_duration
+
+    @property
+    def dependency(self) -> Dependency | None:
+        return self._dependency
+
+    @property
+    def error(self) -> str | None:
+        return self._error
+
+    @property
+    def succeeded(self) -> bool:
+        return self._error is None
+
+
+class AcquisitionFailure(Exception):
+
+    def __init__(self,
+                 message: str,
+                 results: list[AcquisitionResult]) -> None:
+
+        super().__init__(message)
+        self._results: list[AcquisitionResult] = results
+
+    @property
+    def results(self) -> list[AcquisitionResult]:
+        return self._results
+
+
+class AcquisitionPipeline:
+
+    def __init__(self) -> None:
+
+        self._names: list[str] = []
+        self._prepare_per_name: dict[str, Callable[[], Any]] = {}
+        self._build_per_name: dict[str, Callable[[Any, dict[str, Dependency]], Dependency]] = {}
+        self._compile_sources_per_name: dict[str, Callable[[Any, dict[str, Any]], Any] | None] = {}
+        self._required_names_per_name: dict[str, list[str]] = {}
+
+    @property
+    def names(self) -> list[str]:
+        return self._names
+
+    def add(self,
+            name: str,
+            prepare: Callable[[], Any],
+            build: Callable[[Any, dict[str, Dependency]], Dependency],
+            requires: list[str] = [],
+            compile_sources: Callable[[Any, dict[str, Any]], Any] | None = None) -> None:
+
+        if name in self._names:
+            raise ValueError(f'The \'{name:s}\' dependency has already been added to the acquisition pipeline')
+
+        # Only dependencies which were added beforehand can be required, so the pipeline can never form a cycle
+        for required_name in requires:
+            if required_name not in self._names:
+                raise ValueError(f'The \'{name:s}\' dependency requires the \'{required_name:s}\' dependency, which has not been added to the acquisition pipeline')  # noqa: E501
+
+        self._names.append(name)
+        self._prepare_per_name[name] = prepare
+        self._build_per_name[name] = build
+        self._compile_sources_per_name[name] = compile_sources
+        self._required_names_per_name[name] = list(requires)
+
+    def run(self) -> dict[str, Dependency]:
+
+        result_per_name: dict[str, AcquisitionResult] = {}
+        prepared_per_name: dict[str, Any] = {}
+        prepared_event_per_name: dict[str, threading.Event] = {name: threading.Event() for name in self._names}
+        built_event_per_name: dict[str, threading.Event] = {name: threading.Event() for name in self._names}
+
+        def acquire(name: str) -> None:
+
+            preparation_duration: float = 0.0
+            build_duration: float = 0.0
+            dependency: Dependency | None = None
+            error: str | None = None
+
+            try:
+
+                # Fetching and preparing the sources never has to wait on anything else
+                start_time: float = time.perf_counter()
+                try:
+                    prepared_per_name[name] = self._prepare_per_name[name]()
+                finally:
+                    preparation_duration = time.perf_counter() - start_time
+                    prepared_event_per_name[name].set()
+
+                # If the sources can be compiled separately, they only wait on the prepared sources (e.g., the headers)
+                # of every required dependency, rather than on the required dependencies being built
+                prepared: Any = prepared_per_name[name]
+                compile_sources: Callable[[Any, dict[str, Any]], Any] | None = self._compile_sources_per_name[name]
+                if compile_sources:
+
+                    for required_name in self._required_names_per_name[name]:
+                        prepared_event_per_name[required_name].wait()
+
+                    unprepared_required_names: list[str] = \
+                        [required_name for required_name in self._required_names_per_name[name] if required_name not in prepared_per_name]  # noqa: E501
+                    if unprepared_required_names:
+                        raise Exception(f'The following required dependencies could not be prepared: {', '.join(unprepared_required_names):s}')  # noqa: E501
+
+                    start_time = time.perf_counter()
+                    try:
+                        prepared = compile_sources(prepared,
+                                                   {required_name: prepared_per_name[required_name] for required_name in self._required_names_per_name[name]})  # noqa: E501
+                    finally:
+                        build_duration = time.perf_counter() - start_time
+
+                # Otherwise, compilation starts as soon as the sources are ready and every required dependency has been
+                # built, where sources which were already compiled only wait on them to be linked
+                for required_name in self._required_names_per_name[name]:
+                    built_event_per_name[required_name].wait()
+
+                failed_required_names: list[str] = \
+                    [required_name for required_name in self._required_names_per_name[name] if not result_per_name[required_name].succeeded]  # noqa: E501
+                if failed_required_names:
+                    raise Exception(f'The following required dependencies could not be acquired: {', '.join(failed_required_names):s}')  # noqa: E501
+
+                start_time = time.perf_counter()
+                try:
+                    dependency = self._build_per_name[name](prepared,
+                                                            {required_name: result_per_name[required_name].dependency for required_name in self._required_names_per_name[name]})  # noqa: E501
+                finally:
+                    build_duration += time.perf_counter() - start_time
+
+            except Exception:
+                error = traceback.format_exc()
+
+            finally:
+                result_per_name[name] = AcquisitionResult(name,
+                                                          preparation_duration,
+                                                          build_duration,
+                                                          dependency,
+                                                          error)
+                built_event_per_name[name].set()
+
+        # Every dependency gets a worker of its own, since most of the time is spent waiting on the network or on children
+        start_time: float = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(len(self._names), 1)) as executor:
+            list(executor.map(acquire, self._names))
+        wall_time: float = time.perf_counter() - start_time
+
+        results: list[AcquisitionResult] = [result_per_name[name] for name in self._names]
+        formatted_results: str = self._format_results(results, wall_time)
+
+        if not all([result.succeeded for result in results]):
+            raise AcquisitionFailure(formatted_results, results)
+
+        print(formatted_results)
+
+        return {result.name: result.dependency for result in results}
+
+    def _format_results(self,
+                        results: list[AcquisitionResult],
+                        wall_time: float) -> str:
+
+        title: str = 'Dependency Acquisition Results'
+        max_name_length: int = max([len(result.name) for result in results], default=0)
+
+        formatted_results: list[str] = \
+            [f'{result.name:>{max_name_length:d}s}: {'Succesful' if result.succeeded else 'Failure':s} (prepared in {result.preparation_duration:.3f} s, built in {result.build_duration:.3f} s)' for result in results]  # noqa: E501
+        formatted_results.append(f'\nWall time: {wall_time:.3f} s')
+
+        for result in results:
+            if not result.succeeded:
+                formatted_results.append(f'\n{result.name:s}:\n{result.error:s}')
+
+        return f'\n{title:s}\n{'':{'-':s}>{len(title):d}s}\n{'\n'.join(formatted_results):s}\n'  # noqa: E231
@@ -0,0 +1,264 @@
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import subprocess
+import contextlib
+from pathlib import Path
+from datetime import datetime, timezone
+
+from codebase import CodeBase, Dependency
+
+
+BENCHMARK_SCENARIOS: list[str] = ['Full Build',
+                                  'No-Op Build',
+                                  'One Source Touched',
+                                  'One Header Touched']
+
+
+def generate_synthetic_repositories(parent_directory: Path,
+                                    is_C_plus_plus: bool,
+                                    translation_unit_count: int,
+                                    header_fan_out: int,
+                                    include_depth: int) -> tuple[Path, Path]:
+
+    if translation_unit_count < 1 or header_fan_out < 1 or include_depth < 1:
+        raise ValueError('The translation unit count, header fan-out, and include depth of a synthetic repository must all be at least 1')  # noqa: E501
+
+    source_extension: str = '.cpp' if is_C_plus_plus else '.c'
+    header_extension: str = '.hpp' if is_C_plus_plus else '.h'
+
+    # Initialize the Library and Executable repositories in the same layout as the example repositories
+    library_repository_directory: Path = parent_directory/f'Synthetic_C{'++' if is_C_plus_plus else '':s}_Library'
+    executable_repository_directory: Path = parent_directory/f'Synthetic_C{'++' if is_C_plus_plus else '':s}_code'
+
+    for repository_directory in [library_repository_directory, executable_repository_directory]:
+        if repository_directory.exists():
+            shutil.rmtree(repository_directory)
+
+    library_source_directory: Path = library_repository_directory/'src'
+    library_include_directory: Path = library_repository_directory/'include'
+    layer_directory: Path = library_include_directory/'Synthetic'
+    executable_source_directory: Path = executable_repository_directory/'src'
+
+    for directory in [library_source_directory, layer_directory, executable_source_directory]:
+        directory.mkdir(parents=True)
+
+    def header_name(depth: int, index: int) -> str:
+        return f'layer_{depth:d}_{index:d}{header_extension:s}'
+
+    # Write the layered headers, where every header includes every header in the next layer down
+    for depth in range(include_depth):
+        for index in range(header_fan_out):
+
+            guard: str = f'SYNTHETIC_LAYER_{depth:d}_{index:d}_H'
+            lines: list[str] = [f'#ifndef {guard:s}', f'#define {guard:s}', '']
+
+            if depth + 1 < include_depth:
+                lines += [f'#include "{header_name(depth + 1, child):s}"' for child in range(header_fan_out)]
+                lines.append('')
+
+            lines += [f'struct layer_{depth:d}_{index:d}_record {{ int values[{4 + index:d}]; double weight; }};',
+                      '',
+                      f'static inline int layer_{depth:d}_{index:d}_value(int x)',
+                      '{',
+                      f'    return x * {depth + 1:d} + {index:d};',
+                      '}',
+                      '',
+                      '#endif',
+                      '']
+
+            (layer_directory/header_name(depth, index)).write_text('\n'.join(lines))
+
+    # Write the public header of the Library
+    lines = ['#ifndef SYNTHETIC_H', '#define SYNTHETIC_H', '']
+    if is_C_plus_plus:
+        lines += [f'int unit_{unit:d}(int x);' for unit in range(translation_unit_count)]
+    else:
+        lines += ['#ifdef __cplusplus', 'extern "C"', '{', '#endif', '']
+        lines += [f'int unit_{unit:d}(int x);' for unit in range(translation_unit_count)]
+        lines += ['', '#ifdef __cplusplus', '}', '#endif']
+    lines += ['', '#endif', '']
+    (library_include_directory/f'Synthetic{header_extension:s}').write_text('\n'.join(lines))
+
+    # Write the translation units of the Library, each including a round-robin selection of the top layer
+    for unit in range(translation_unit_count):
+
+        included_headers: list[int] = sorted(set([(unit + offset) % header_fan_out for offset in range(header_fan_out)]))
+
+        lines = [f'#include <Synthetic{header_extension:s}>']
+        lines += [f'#include <Synthetic/{header_name(0, index):s}>' for index in included_headers]
+        lines += ['',
+                  f'int unit_{unit:d}(int x)',
+                  '{',
+                  f'    return {' + '.join([f'layer_0_{index:d}_value(x)' for index in included_headers]):s};',
+                  '}',
+                  '']
+
+        (library_source_directory/f'unit_{unit:d}{source_extension:s}').write_text('\n'.join(lines))
+
+    # Write the Executable which calls into every translation unit of the Library
+    lines = [f'#include <Synthetic{header_extension:s}>', '#include <stdio.h>', '', 'int main(void)', '{', '    int total = 0;']
+    lines += [f'    total += unit_{unit:d}({unit:d});' for unit in range(translation_unit_count)]
+    lines += ['    printf("%d\\n", total);', '    return 0;', '}', '']
+    (executable_source_directory/f'main{source_extension:s}').write_text('\n'.join(lines))
+
+    return (library_repository_directory,
+            executable_repository_directory)
+
+
+def touch_file(file_path: Path) -> None:
+
+    # Append a comment rather than only bumping the modification time, so that content-based checks also see an edit
+    with open(file_path, 'a') as touched_file:
+        touched_file.write(f'/* touched at {time.time_ns():d} */\n')
+
+
+def build_synthetic_repositories(library_repository_directory: Path,
+                                 executable_repository_directory: Path,
+                                 language_standard: str,
+                                 library_is_dynamic: bool) -> float:
+
+    # Both code bases are built incrementally, so that the No-Op and Touched scenarios only pay for what changed,
+    # and none of the benchmark builds are recorded in the build history
+    library_codebase: CodeBase = \
+        CodeBase('Synthetic',
+                 library_repository_directory,
+                 language_standard=language_standard,
+                 incremental=True,
+                 build_database_path=None)
+
+    library: Dependency = library_codebase.generate_as_dependency(library_is_dynamic)
+
+    executable_codebase: CodeBase = \
+        CodeBase('synthetic',
+                 executable_repository_directory,
+                 language_standard=language_standard,
+                 incremental=True,
+                 build_database_path=None)
+
+    executable_codebase.add_dependency(library)
+    executable_codebase.generate_as_executable()
+
+    # Return the time spent within the compiler, archiver, and linker, so that the overhead of the tool can be told apart
+    return library_codebase.command_duration + executable_codebase.command_duration
+
+
+def run_benchmark(benchmark_directory: Path,
+                  results_path: Path,
+                  is_C_plus_plus: bool = True,
+                  translation_unit_count: int = 32,
+                  header_fan_out: int = 4,
+                  include_depth: int = 3,
+                  library_is_dynamic: bool = False,
+                  repetitions: int = 3,
+                  quiet: bool = True) -> dict:
+
+    if repetitions < 1:
+        raise ValueError('The benchmark must be repeated at least once')
+
+    language_standard: str = 'C++ 2020' if is_C_plus_plus else 'C 2018'
+
+    # The compile commands are run from within each repository, so every path handed to them must be absolute
+    benchmark_directory = benchmark_directory.resolve()
+    if not benchmark_directory.exists():
+        benchmark_directory.mkdir(parents=True)
+
+    (library_repository_directory,
+     executable_repository_directory) = \
+        generate_synthetic_repositories(benchmark_directory,
+                                        is_C_plus_plus,
+                                        translation_unit_count,
+                                        header_fan_out,
+                                        include_depth)
+
+    touched_source_path: Path = \
+        sorted((library_repository_directory/'src').iterdir())[0]
+    touched_header_path: Path = \
+        library_repository_directory/'include'/'Synthetic'/f'layer_{include_depth - 1:d}_0.{'hpp' if is_C_plus_plus else 'h':s}'
+
+    def timed_build(scenario: str) -> tuple[float, float]:
+
+        if scenario == 'Full Build':
+            for repository_directory in [library_repository_directory, executable_repository_directory]:
+                if (repository_directory/'build').exists():
+                    shutil.rmtree(repository_directory/'build')
+        elif scenario == 'One Source Touched':
+            touch_file(touched_source_path)
+        elif scenario == 'One Header Touched':
+            touch_file(touched_header_path)
+
+        start_time: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            command_duration: float = build_synthetic_repositories(library_repository_directory,
+                                                                   executable_repository_directory,
+                                                                   language_standard,
+                                                                   library_is_dynamic)
+
+        return (time.perf_counter() - start_time,
+                command_duration)
+
+    # Run every scenario in order for every repetition, so that the No-Op and Touched builds follow a complete build
+    durations_per_scenario: dict[str, list[float]] = {scenario: [] for scenario in BENCHMARK_SCENARIOS}
+    command_durations_per_scenario: dict[str, list[float]] = {scenario: [] for scenario in BENCHMARK_SCENARIOS}
+    for _ in range(repetitions):
+        for scenario in BENCHMARK_SCENARIOS:
+            duration, command_duration = timed_build(scenario)
+            durations_per_scenario[scenario].append(duration)
+            command_durations_per_scenario[scenario].append(command_duration)
+
+    def summarize(durations: list[float]) -> dict:
+        return {'durations': durations,
+                'minimum': min(durations),
+                'median': sorted(durations)[len(durations)//2],
+                'maximum': max(durations)}
+
+    compiler_version: str = \
+        subprocess.run(['g++' if is_C_plus_plus else 'gcc', '--version'],
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE).stdout.decode('utf-8').splitlines()[0]
+
+    results: dict = \
+        {'timestamp': datetime.now(timezone.utc).isoformat(),
+         'environment': {'platform': platform.platform(),
+                         'python': sys.version.split()[0],
+                         'compiler': compiler_version},
+         'configuration': {'language_standard': language_standard,
+                           'translation_unit_count': translation_unit_count,
+                           'header_fan_out': header_fan_out,
+                           'include_depth': include_depth,
+                           'library_is_dynamic': library_is_dynamic,
+                           'repetitions': repetitions},
+         'scenarios': {scenario: summarize(durations) | {'compiler': summarize(command_durations_per_scenario[scenario]),  # noqa: E501
+                                                         'overhead': summarize([duration - command_duration for duration, command_duration in zip(durations, command_durations_per_scenario[scenario])])}  # noqa: E501
+                       for scenario, durations in durations_per_scenario.items()}}
+
+    with open(results_path, 'w') as results_file:
+        json.dump(results, results_file, indent=4)
+
+    return results
+
+
+if (__name__ == '__main__'):
+
+    is_C_plus_plus: bool = True
+    translation_unit_count: int = 32
+    header_fan_out: int = 4
+    include_depth: int = 3
+    library_is_dynamic: bool = False
+    repetitions: int = 3
+
+    results: dict = \
+        run_benchmark(Path.cwd()/'benchmark_repos',
+                      Path.cwd()/'benchmark_repos'/'benchmark_results.json',
+                      is_C_plus_plus,
+                      translation_unit_count,
+                      header_fan_out,
+                      include_depth,
+                      library_is_dynamic,
+                      repetitions)
+
+    for scenario, statistics in results['scenarios'].items():
+        print(f'{scenario:>20s}: {statistics['median']:.3f} s, of which {statistics['compiler']['median']:.3f} s compiling and linking and {statistics['overhead']['median']:.3f} s overhead (median of {repetitions:d})')  # noqa: E501
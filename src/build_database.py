@@ -0,0 +1,343 @@
+import time
+import sqlite3
+import statistics
+import contextlib
+from pathlib import Path
+from datetime import datetime, timezone
+
+
+DEFAULT_BUILD_DATABASE_PATH: Path = Path(__file__).resolve().parent.parent/'build_history.sqlite3'
+
+BUILD_KINDS: list[str] = ['Full', 'Incremental', 'No-Op']
+
+BUILD_DATABASE_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    codebase TEXT NOT NULL,
+    repository_directory TEXT NOT NULL,
+    build_directory TEXT NOT NULL,
+    git_commit TEXT,
+    configuration_hash TEXT,
+    build_kind TEXT,
+    started_at TEXT NOT NULL,
+    wall_time REAL NOT NULL,
+    translation_unit_count INTEGER NOT NULL,
+    cache_hits INTEGER NOT NULL,
+    succeeded INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    build_id INTEGER NOT NULL REFERENCES builds (id),
+    description TEXT NOT NULL,
+    command TEXT NOT NULL,
+    source_file TEXT,
+    duration REAL NOT NULL,
+    exit_status INTEGER NOT NULL,
+    output_size INTEGER NOT NULL,
+    cache_hit INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS builds_per_codebase ON builds (codebase, build_directory);
+CREATE INDEX IF NOT EXISTS commands_per_source_file ON commands (source_file);
+'''
+
+# Columns which were added to the builds table after it was first created, along with their types
+BUILD_DATABASE_ADDED_COLUMNS: dict[str, str] = {'configuration_hash': 'TEXT',
+                                                'build_kind': 'TEXT'}
+
+
+class CommandRecord:
+
+    def __init__(self,
+                 description: str,
+                 command: str,
+                 source_file_path: Path | None,
+                 duration: float,
+                 exit_status: int,
+                 output_size: int,
+                 cache_hit: bool) -> None:
+
+        self._description: str = description
+        self._command: str = command
+        self._source_file_path: Path | None = source_file_path
+        self._duration: float = duration
+        self._exit_status: int = exit_status
+        self._output_size: int = output_size
+        self._cache_hit: bool = cache_hit
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def command(self) -> str:
+        return self._command
+
+    @property
+    def source_file_path(self) -> Path | None:
+        return self._source_file_path
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def exit_status(self) -> int:
+        return self._exit_status
+
+    @property
+    def output_size(self) -> int:
+        return self._output_size
+
+    @property
+    def cache_hit(self) -> bool:
+        return self._cache_hit
+
+
+class BuildRecord:
+
+    def __init__(self,
+                 codebase_name: str,
+                 repository_directory: Path,
+                 build_directory: Path,
+                 git_commit: str | None,
+                 configuration_hash: str,
+                 is_partial: bool = False) -> None:
+
+        self._codebase_name: str = codebase_name
+        self._repository_directory: Path = repository_directory
+        self._build_directory: Path = build_directory
+        self._git_commit: str | None = git_commit
+
+        # Builds are only ever compared against builds with the same compiler and flags (e.g., Debug vs. Release)
+        self._configuration_hash: str = configuration_hash
+
+        # A partial build only ever runs what changed (e.g., a watch-mode rebuild), without recording what it skipped
+        self._is_partial: bool = is_partial
+
+        self._started_at: str = datetime.now(timezone.utc).isoformat()
+        self._start_time: float = time.perf_counter()
+        self._wall_time: float = 0.0
+        self._succeeded: bool = False
+
+        self._commands: list[CommandRecord] = []
+
+    @property
+    def codebase_name(self) -> str:
+        return self._codebase_name
+
+    @property
+    def repository_directory(self) -> Path:
+        return self._repository_directory
+
+    @property
+    def build_directory(self) -> Path:
+        return self._build_directory
+
+    @property
+    def git_commit(self) -> str | None:
+        return self._git_commit
+
+    @property
+    def configuration_hash(self) -> str:
+        return self._configuration_hash
+
+    @property
+    def is_partial(self) -> bool:
+        return self._is_partial
+
+    @property
+    def started_at(self) -> str:
+        return self._started_at
+
+    @property
+    def commands(self) -> list[CommandRecord]:
+        return self._commands
+
+    @property
+    def translation_unit_count(self) -> int:
+        return len(set([command.source_file_path for command in self._commands if command.source_file_path]))
+
+    @property
+    def cache_hits(self) -> int:
+        return len([command for command in self._commands if command.cache_hit])
+
+    @property
+    def build_kind(self) -> str:
+
+        # A build where nothing ran is a No-Op, and a build where every translation unit was compiled is a Full build,
+        # since their wall times have nothing to do with one another (nor with those of any build in between)
+        if all([command.cache_hit for command in self._commands]):
+            return 'No-Op'
+        if not self._is_partial and not any([command.cache_hit for command in self._commands if command.source_file_path]):  # noqa: E501
+            return 'Full'
+        return 'Incremental'
+
+    @property
+    def wall_time(self) -> float:
+        return self._wall_time
+
+    @property
+    def succeeded(self) -> bool:
+        return self._succeeded
+
+    def add_command(self,
+                    new_command: CommandRecord) -> None:
+        self._commands.append(new_command)
+
+    def finish(self,
+               succeeded: bool) -> None:
+
+        self._wall_time = time.perf_counter() - self._start_time
+        self._succeeded = succeeded
+
+
+class BuildDatabase:
+
+    def __init__(self,
+                 database_path: Path = DEFAULT_BUILD_DATABASE_PATH) -> None:
+
+        self._database_path: Path = database_path
+
+        with self._connect() as connection:
+            connection.executescript(BUILD_DATABASE_SCHEMA)
+
+            # Databases created before a column was added get it too, where older builds simply have no value for it
+            existing_columns: list[str] = [row[1] for row in connection.execute('PRAGMA table_info(builds)').fetchall()]
+            for column, column_type in BUILD_DATABASE_ADDED_COLUMNS.items():
+                if column not in existing_columns:
+                    connection.execute(f'ALTER TABLE builds ADD COLUMN {column:s} {column_type:s}')
+
+    @property
+    def database_path(self) -> Path:
+        return self._database_path
+
+    @contextlib.contextmanager
+    def _connect(self):
+
+        # A connection is opened per operation, so that concurrent builds (e.g., a variant matrix) can share the database
+        connection: sqlite3.Connection = sqlite3.connect(self._database_path, timeout=30.0)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record_build(self,
+                     build_record: BuildRecord) -> int:
+
+        with self._connect() as connection:
+
+            build_id: int = \
+                connection.execute('INSERT INTO builds (codebase, repository_directory, build_directory, git_commit, configuration_hash, build_kind, started_at, wall_time, translation_unit_count, cache_hits, succeeded) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',  # noqa: E501
+                                   (build_record.codebase_name,
+                                    str(build_record.repository_directory),
+                                    str(build_record.build_directory),
+                                    build_record.git_commit,
+                                    build_record.configuration_hash,
+                                    build_record.build_kind,
+                                    build_record.started_at,
+                                    build_record.wall_time,
+                                    build_record.translation_unit_count,
+                                    build_record.cache_hits,
+                                    int(build_record.succeeded))).lastrowid
+
+            connection.executemany('INSERT INTO commands (build_id, description, command, source_file, duration, exit_status, output_size, cache_hit) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',  # noqa: E501
+                                   [(build_id,
+                                     command.description,
+                                     command.command,
+                                     str(command.source_file_path) if command.source_file_path else None,
+                                     command.duration,
+                                     command.exit_status,
+                                     command.output_size,
+                                     int(command.cache_hit)) for command in build_record.commands])
+
+        return build_id
+
+    def slower_builds(self,
+                      window: int = 10,
+                      threshold: float = 1.25,
+                      minimum_slowdown: float = 0.05) -> list[tuple[str, str, str, float, float]]:
+
+        # Compare the latest successful build of each code base against the median of the builds preceding it,
+        # where only builds of the same kind with the same configuration are comparable
+        slower_builds: list[tuple[str, str, str, float, float]] = []
+
+        with self._connect() as connection:
+
+            baselines: list[tuple[str, str, str, str]] = \
+                connection.execute('SELECT DISTINCT codebase, build_directory, configuration_hash, build_kind FROM builds WHERE succeeded = 1 AND configuration_hash IS NOT NULL AND build_kind IS NOT NULL ORDER BY codebase, build_directory, build_kind').fetchall()  # noqa: E501
+
+            for codebase, build_directory, configuration_hash, build_kind in baselines:
+
+                wall_times: list[float] = \
+                    [row[0] for row in connection.execute('SELECT wall_time FROM builds WHERE codebase = ? AND build_directory = ? AND configuration_hash = ? AND build_kind = ? AND succeeded = 1 ORDER BY id DESC LIMIT ?',  # noqa: E501
+                                                          (codebase, build_directory, configuration_hash, build_kind, window + 1)).fetchall()]  # noqa: E501
+
+                if len(wall_times) > 1:
+                    latest_wall_time: float = wall_times[0]
+                    baseline_wall_time: float = statistics.median(wall_times[1:])
+                    if latest_wall_time > threshold*baseline_wall_time and latest_wall_time - baseline_wall_time > minimum_slowdown:  # noqa: E501
+                        slower_builds.append((codebase, build_directory, build_kind, latest_wall_time, baseline_wall_time))  # noqa: E501
+
+        return slower_builds
+
+    def slower_translation_units(self,
+                                 window: int = 10,
+                                 threshold: float = 1.25,
+                                 minimum_slowdown: float = 0.05) -> list[tuple[str, float, float]]:
+
+        # Cache hits say nothing about how long a translation unit takes to compile, so they are left out,
+        # and a translation unit is only compared against its compilations with the same configuration
+        slower_translation_units: list[tuple[str, float, float]] = []
+
+        with self._connect() as connection:
+
+            baselines: list[tuple[str, str]] = \
+                connection.execute('SELECT DISTINCT commands.source_file, builds.configuration_hash FROM commands JOIN builds ON builds.id = commands.build_id WHERE commands.source_file IS NOT NULL AND commands.cache_hit = 0 AND commands.exit_status = 0 AND builds.configuration_hash IS NOT NULL ORDER BY commands.source_file').fetchall()  # noqa: E501
+
+            for source_file, configuration_hash in baselines:
+
+                durations: list[float] = \
+                    [row[0] for row in connection.execute('SELECT commands.duration FROM commands JOIN builds ON builds.id = commands.build_id WHERE commands.source_file = ? AND builds.configuration_hash = ? AND commands.cache_hit = 0 AND commands.exit_status = 0 ORDER BY commands.id DESC LIMIT ?',  # noqa: E501
+                                                          (source_file, configuration_hash, window + 1)).fetchall()]
+
+                if len(durations) > 1:
+                    latest_duration: float = durations[0]
+                    baseline_duration: float = statistics.median(durations[1:])
+                    if latest_duration > threshold*baseline_duration and latest_duration - baseline_duration > minimum_slowdown:  # noqa: E501
+                        slower_translation_units.append((source_file, latest_duration, baseline_duration))
+
+        return slower_translation_units
+
+    def report(self,
+               window: int = 10,
+               threshold: float = 1.25,
+               minimum_slowdown: float = 0.05) -> str:
+
+        def format_section(title: str,
+                           lines: list[str]) -> str:
+            return f'{title:s}:\n{'':{'-':s}>{len(title) + 1:d}s}\n{'\n'.join(lines) if lines else 'None':s}'  # noqa: E231
+
+        slower_builds: list[tuple[str, str, str, float, float]] = self.slower_builds(window, threshold, minimum_slowdown)
+        slower_translation_units: list[tuple[str, float, float]] = \
+            self.slower_translation_units(window, threshold, minimum_slowdown)
+
+        description: str = \
+            '\n\n'.join([f'Build Regressions (latest vs. median of the previous {window:d}, flagged above {threshold:.2f}x)',  # noqa: E501
+                         format_section('Slower Builds',
+                                        [f'{codebase:s} ({build_directory:s}, {build_kind:s}): {latest:.3f} s vs. {baseline:.3f} s' for codebase, build_directory, build_kind, latest, baseline in slower_builds]),  # noqa: E501
+                         format_section('Slower Translation Units',
+                                        [f'{source_file:s}: {latest:.3f} s vs. {baseline:.3f} s' for source_file, latest, baseline in slower_translation_units])])  # noqa: E501
+
+        return f'\n{description:s}\n'
+
+
+if (__name__ == '__main__'):
+
+    window: int = 10
+    threshold: float = 1.25
+    minimum_slowdown: float = 0.05
+
+    print(BuildDatabase().report(window,
+                                 threshold,
+                                 minimum_slowdown))
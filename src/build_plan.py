@@ -0,0 +1,156 @@
+import shlex
+import hashlib
+from pathlib import Path
+
+from modules import ModuleGraph
+
+
+COMPILE_ACTION: str = 'Compile'
+ARCHIVE_ACTION: str = 'Archive'
+LINK_ACTION: str = 'Link'
+PACKAGE_ACTION: str = 'Package'
+
+
+def flag_arguments(flags: list[str]) -> list[str]:
+
+    # Flags are written without their leading dash, and flags taking a value (e.g., 'I <directory>') become two arguments
+    return [argument for flag in flags for argument in f'-{flag:s}'.split(' ', 1)]
+
+
+class BuildAction:
+
+    def __init__(self,
+                 kind: str,
+                 description: str,
+                 arguments: list[str],
+                 working_directory: Path,
+                 inputs: list[Path],
+                 outputs: list[Path],
+                 source_file_path: Path | None = None) -> None:
+
+        self._kind: str = kind
+        self._description: str = description
+        self._arguments: tuple[str, ...] = tuple(arguments)
+        self._working_directory: Path = working_directory
+        self._inputs: tuple[Path, ...] = tuple(inputs)
+        self._outputs: tuple[Path, ...] = tuple(outputs)
+        self._source_file_path: Path | None = source_file_path
+
+        # The hash only covers what the action does, not how it is described, so equal actions always hash equally
+        action_hash = hashlib.sha256()
+        for field in [self._kind, str(self._working_directory)] + list(self._arguments) + \
+                     ['inputs'] + [str(input_path) for input_path in self._inputs] + \
+                     ['outputs'] + [str(output_path) for output_path in self._outputs]:
+            action_hash.update(f'{field:s}\0'.encode('utf-8'))
+        self._hash: str = action_hash.hexdigest()
+
+    def __str__(self) -> str:
+        return f'{self._description:s}\n\tWorking directory: {str(self._working_directory):s}\n\tCommand: {self.command:s}'  # noqa: E501
+
+    def __eq__(self,
+               other: object) -> bool:
+        return isinstance(other, BuildAction) and self._hash == other._hash
+
+    def __hash__(self) -> int:
+        return hash(self._hash)
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def arguments(self) -> tuple[str, ...]:
+        return self._arguments
+
+    @property
+    def command(self) -> str:
+        return shlex.join(self._arguments)
+
+    @property
+    def working_directory(self) -> Path:
+        return self._working_directory
+
+    @property
+    def inputs(self) -> tuple[Path, ...]:
+        return self._inputs
+
+    @property
+    def outputs(self) -> tuple[Path, ...]:
+        return self._outputs
+
+    @property
+    def source_file_path(self) -> Path | None:
+        return self._source_file_path
+
+    @property
+    def hash(self) -> str:
+        return self._hash
+
+
+class BuildPlan:
+
+    def __init__(self,
+                 name: str,
+                 actions: list[BuildAction],
+                 module_graph: ModuleGraph | None = None) -> None:
+
+        self._name: str = name
+        self._actions: tuple[BuildAction, ...] = tuple(actions)
+
+        # The module graph the compile actions were ordered by is kept along with them, so that running the plan never
+        # disagrees with it (e.g., if a module interface started importing another module since the plan was made)
+        self._module_graph: ModuleGraph | None = module_graph
+
+        # An action depends on whichever earlier action produced one of its inputs, anything else is a source
+        producer_per_output: dict[Path, BuildAction] = {}
+        self._predecessors_per_action: dict[BuildAction, tuple[BuildAction, ...]] = {}
+        for action in self._actions:
+            self._predecessors_per_action[action] = \
+                tuple(dict.fromkeys([producer_per_output[input_path] for input_path in action.inputs if input_path in producer_per_output]))  # noqa: E501
+            for output_path in action.outputs:
+                producer_per_output[output_path] = action
+
+        plan_hash = hashlib.sha256()
+        for action in self._actions:
+            plan_hash.update(f'{action.hash:s}\0'.encode('utf-8'))
+        self._hash: str = plan_hash.hexdigest()
+
+    def __str__(self) -> str:
+
+        title: str = f'\'{self._name:s}\' Build Plan ({len(self._actions):d} actions, {self._hash[:12]:s})'
+
+        return f'\n{title:s}\n{'':{'-':s}>{len(title):d}s}\n{'\n\n'.join([str(action) for action in self._actions]):s}\n'  # noqa: E231, E501
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def actions(self) -> tuple[BuildAction, ...]:
+        return self._actions
+
+    @property
+    def module_graph(self) -> ModuleGraph | None:
+        return self._module_graph
+
+    @property
+    def compile_actions(self) -> list[BuildAction]:
+        return [action for action in self._actions if action.kind == COMPILE_ACTION]
+
+    @property
+    def link_actions(self) -> list[BuildAction]:
+
+        # Everything after compilation, i.e., archiving or linking the object files and packaging their debug information
+        return [action for action in self._actions if action.kind != COMPILE_ACTION]
+
+    @property
+    def hash(self) -> str:
+        return self._hash
+
+    def predecessors_of(self,
+                        action: BuildAction) -> tuple[BuildAction, ...]:
+        return self._predecessors_per_action[action]
@@ -1,10 +1,30 @@
+import os
 import re
-import shutil
+import time
+import shlex
+import hashlib
+import threading
+import contextlib
+import subprocess
 from pathlib import Path
-
-from command import run_command
-from dependency import Dependency
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from git import get_current_commit
+from command import run_command, CommandFailure
+from dependency import Dependency, library_extension
+from depfile import read_depfile
+from staging import stage_file
+from object_cache import ObjectCache
+from build_database import DEFAULT_BUILD_DATABASE_PATH, BuildDatabase, BuildRecord, CommandRecord
+from profiling import PROFILING_FLAGS, CompilationProfile, ProfileReport
+from modules import MODULE_FLAGS, ModuleGraph, ModuleInterfaceCache
+from linking import list_archive_members, hash_link_inputs, link_is_up_to_date
+from build_plan import COMPILE_ACTION, ARCHIVE_ACTION, LINK_ACTION, PACKAGE_ACTION, BuildAction, BuildPlan, flag_arguments
+from executable_tests import TestResult, TestRunner, discover_test_cases
+from intermediates import DEFAULT_INTERMEDIATE_SIZE_CAP, RAM_BACKED_FLAGS, IntermediateDirectory
+from toolchain import DEFAULT_TOOLCHAIN_CACHE_PATH, ToolchainProbe, probe_toolchain
 from compilation_constants import FLAGS_PER_BUILD_CONFIGURATION
+from compilation_constants import FLAGS_PER_DEBUG_INFORMATION_MODE
 from compilation_constants import C_PLUS_PLUS_LANGUAGE_STANDARDS
 from compilation_constants import FLAG_PER_WARNING
 from compilation_constants import FLAG_PER_MISCELLANEOUS_DECISION
@@ -13,6 +33,7 @@ from compilation_constants import C_PLUS_PLUS_HEADER_EXTENSIONS
 from compilation_constants import C_LANGUAGE_STANDARDS
 from compilation_constants import C_SOURCE_CODE_EXTENSIONS
 from compilation_constants import C_HEADER_EXTENSIONS
+from compilation_constants import DEPENDENCY_TRACKING_FLAGS
 
 
 class CodeBase:
@@ -24,7 +45,20 @@ class CodeBase:
                  language_standard: str = f'C++ {2011 + 3*C_PLUS_PLUS_LANGUAGE_STANDARDS.index('2a'):d}',
                  warnings: str | list[str] = list(FLAG_PER_WARNING.keys()),
                  miscellaneous: str | list[str] = list(FLAG_PER_MISCELLANEOUS_DECISION.keys()),
-                 preprocessor_variables: list[str] = []) -> None:
+                 preprocessor_variables: list[str] = [],
+                 profile: bool = False,
+                 incremental: bool = False,
+                 build_directory: Path | None = None,
+                 object_cache: ObjectCache | None = None,
+                 debug_information: str = list(FLAGS_PER_DEBUG_INFORMATION_MODE.keys())[0],
+                 package_debug_information: bool = False,
+                 build_database_path: Path | None = DEFAULT_BUILD_DATABASE_PATH,
+                 modules: bool = False,
+                 ram_backed_intermediates: bool = False,
+                 intermediate_size_cap: int = DEFAULT_INTERMEDIATE_SIZE_CAP,
+                 toolchain_cache_path: Path | None = DEFAULT_TOOLCHAIN_CACHE_PATH,
+                 probe_compiler: bool = True,
+                 job_pool: Executor | None = None) -> None:
 
         self._name: str = name
 
@@ -40,15 +74,34 @@ class CodeBase:
         if not source_code_exists:
             raise ValueError(f'No directory labelled \'src\' was found in the \'{self._name:s}\' repository, please create it and put your source code to be compiled there')  # noqa: E501
 
-        # Initialize the Build and Binary directories
-        self._build_directory: Path = self._repository_directory/'build'
+        # Initialize the Build and Binary directories, where the Build directory may be isolated from the default one
+        self._build_directory: Path = build_directory if build_directory else self._repository_directory/'build'
         self._binary_directory: Path = self._build_directory/'bin'
 
+        # Initialize the directory of intermediate files (object files, depfiles, etc.), which may be kept in RAM,
+        # whereas only the final artifacts (within the Library and Binary directories) are written to the Build directory
+        self._intermediate_directory: IntermediateDirectory = \
+            IntermediateDirectory(self._build_directory,
+                                  ram_backed_intermediates,
+                                  intermediate_size_cap)
+
         # Set the build configuration, and check to make sure it makes sense
         self._build_configuration: str = build_configuration
         if self._build_configuration not in FLAGS_PER_BUILD_CONFIGURATION:
             raise ValueError(f"The following build configuration is not recognized: {self._build_configuration:s}")   # noqa: E501
 
+        # Set the debug information mode, and check to make sure it makes sense
+        self._debug_information: str = debug_information
+        if self._debug_information not in FLAGS_PER_DEBUG_INFORMATION_MODE:
+            raise ValueError(f'The following debug information mode is not recognized: {self._debug_information:s}')
+        if FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information] and self._build_configuration != 'Debug':
+            raise ValueError(f'The \'{self._debug_information:s}\' debug information mode only applies to the Debug build configuration')  # noqa: E501
+
+        # Only split debug information can be packaged into a .dwp file
+        self._package_debug_information: bool = package_debug_information
+        if self._package_debug_information and 'gsplit-dwarf' not in FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information]:  # noqa: E501
+            raise ValueError(f'The \'{self._debug_information:s}\' debug information mode does not split the debug information, so there is nothing to package')  # noqa: E501
+
         # Set the warning, and check to make sure they make sense
         self._warnings: list[str] = [warnings] if isinstance(warnings, str) else warnings
         for warning in self._warnings:
@@ -106,9 +159,40 @@ class CodeBase:
         if not language_standard_recognized:
             raise ValueError(f'The following Language Standard is not recognized: {self._language_standard:s}')
 
+        # Initialize the C++20 modules support, where compiled module interfaces are cached within the Build directory
+        self._modules: bool = modules
+        if self._modules:
+            if self._utility != 'g++' or C_PLUS_PLUS_LANGUAGE_STANDARDS.index(self._language_standard_flag[2:]) < C_PLUS_PLUS_LANGUAGE_STANDARDS.index('2a'):  # noqa: E501
+                raise ValueError(f'Modules require a language standard of C++ 2020 or later, not {self._language_standard:s}')  # noqa: E501
+        self._module_interface_cache: ModuleInterfaceCache = \
+            ModuleInterfaceCache(self._intermediate_directory.path/'gcm.cache',
+                                 self._repository_directory)
+
         # Initialize the list of preprocessor variables
         self._preprocessor_variables: list[str] = preprocessor_variables
 
+        # Initialize the profiling mode, along with the report of the most recent build
+        self._profile: bool = profile
+        self._profile_report: ProfileReport | None = None
+
+        # Initialize the incremental mode, which keeps object files and depfiles between builds
+        self._incremental: bool = incremental
+
+        # Initialize the cache of object files which may be shared with other builds
+        self._object_cache: ObjectCache | None = object_cache
+
+        # Initialize the build history, where None turns off the recording of builds
+        self._build_database_path: Path | None = build_database_path
+        self._build_record: BuildRecord | None = None
+
+        # Initialize the time spent running the compiler, archiver, and linker during the most recent build
+        self._command_duration: float = 0.0
+        self._command_duration_lock: threading.Lock = threading.Lock()
+
+        # Initialize the pool which every action runs within, where None runs every action one at a time,
+        # and a pool shared by several code bases (e.g., the variants of a VariantMatrix) shares its job budget
+        self._job_pool: Executor | None = job_pool
+
         # Initialize the list of Dependencies
         self._dependencies: list[Dependency] = []
 
@@ -119,6 +203,16 @@ class CodeBase:
                                                  include_directory,
                                                  True))
 
+        # Initialize the probe of the compiler, which only runs once per compiler at the first build (so that neither
+        # planning nor merely configuring a code base pays for it, or needs the compiler to be installed), unless the
+        # compiler was already probed, in which case any unsupported flag is reported right away
+        self._probe_compiler: bool = probe_compiler
+        self._toolchain_cache_path: Path | None = toolchain_cache_path
+        self._toolchain_probe: ToolchainProbe | None = \
+            probe_toolchain(self._utility, self._toolchain_cache_path, cached_only=True) if self._probe_compiler else None  # noqa: E501
+        if self._toolchain_probe:
+            self._check_compilation_flags()
+
     def __str__(self) -> str:
 
         def format_flag_statuses(title: str,
@@ -142,6 +236,8 @@ class CodeBase:
                                              self._build_configuration),
                           format_chosen_flag('Language Standard',
                                              self._language_standard),
+                          format_chosen_flag('Debug Information',
+                                             f'{self._debug_information:s}{' (Packaged)' if self._package_debug_information else '':s}'),  # noqa: E501
                           format_flag_statuses('Warning',
                                                list(FLAG_PER_WARNING.keys()),
                                                self._warnings),
@@ -171,6 +267,10 @@ class CodeBase:
     def binary_directory(self) -> Path:
         return self._binary_directory
 
+    @property
+    def intermediate_directory(self) -> Path:
+        return self._intermediate_directory.path
+
     @property
     def build_configuration(self) -> str:
         return self._build_configuration
@@ -179,6 +279,10 @@ class CodeBase:
     def language_standard(self) -> str:
         return self._language_standard
 
+    @property
+    def debug_information(self) -> str:
+        return self._debug_information
+
     @property
     def warnings(self) -> list[str]:
         return self._warnings
@@ -187,99 +291,448 @@ class CodeBase:
     def miscellaneous(self) -> list[str]:
         return self._miscellaneous
 
-    def _generate_object_files(self) -> list[Path]:
+    @property
+    def incremental(self) -> bool:
+        return self._incremental
 
-        print(self)
+    @property
+    def modules(self) -> bool:
+        return self._modules
+
+    @property
+    def source_code_extensions(self) -> list[str]:
+        return self._source_code_extensions
+
+    @property
+    def dependencies(self) -> list[Dependency]:
+        return self._dependencies
+
+    @property
+    def profile_report(self) -> ProfileReport | None:
+        return self._profile_report
+
+    @property
+    def command_duration(self) -> float:
+        return self._command_duration
+
+    @property
+    def toolchain_probe(self) -> ToolchainProbe | None:
+        return self._toolchain_probe
+
+    def _compilation_flags(self) -> list[str]:
 
         # Get flags from the compilation settings
         formatted_flags: list[str] = \
             (FLAGS_PER_BUILD_CONFIGURATION[self._build_configuration] +
+             FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information] +
              [f'std=c{self._language_standard_flag:s}'] +
              [f'W{flag:s}' for warning, flag in FLAG_PER_WARNING.items() if warning in self._warnings] +
              [flag for decision, flag in FLAG_PER_MISCELLANEOUS_DECISION.items() if decision in self._miscellaneous] +  # noqa: E501
              [f'D {variable:s}' for variable in self._preprocessor_variables])
 
-        # Get optional flags based on Dependencies
+        # GNU dwp can only package DWARF 4, whereas GCC defaults to DWARF 5 since version 11
+        if self._package_debug_information:
+            formatted_flags += ['gdwarf-4']
+
+        # Get the compiler self-profiling flags if profiling
+        if self._profile:
+            formatted_flags += PROFILING_FLAGS
+
+        # Get the depfile flags if building incrementally, if module interfaces need to be cached,
+        # or if object files are cached (since only the depfile tells which headers an object file depends on)
+        if self._incremental or self._modules or self._object_cache:
+            formatted_flags += DEPENDENCY_TRACKING_FLAGS
+
+        # Pipe between the compiler passes instead of writing temporary files if intermediate files are kept in RAM
+        if self._intermediate_directory.is_ram_backed:
+            formatted_flags += RAM_BACKED_FLAGS
+
+        # Get the module flags, where the mapper file points every module at its compiled interface
+        if self._modules:
+            formatted_flags += MODULE_FLAGS + [f'fmodule-mapper={str(self._module_interface_cache.mapper_path.resolve()):s}']  # noqa: E501
+
+        # Get optional flags based on Dependencies, keeping the order in which they were added (it decides header lookup)
         if self._dependencies:
-            formatted_flags += list(set([f'I {str(dependency.include_directory):s}' for dependency in self._dependencies]))  # noqa: E501
+            formatted_flags += list(dict.fromkeys([f'I {str(dependency.include_directory):s}' for dependency in self._dependencies]))  # noqa: E501
+
+        return formatted_flags
+
+    def _compilation_arguments(self) -> list[str]:
+        return flag_arguments(self._compilation_flags())
+
+    def _formatted_compilation_flags(self) -> str:
+        return ' '.join(self._compilation_arguments())
+
+    def _source_file_paths(self) -> list[Path]:
+
+        # Walk through the Source directory and collect each individual C/C++ source file, in a stable order
+        return sorted([root/file for root, _, files in self._source_directory.walk() for file in files if (root/file).suffix in self._source_code_extensions])  # noqa: E501
+
+    def _object_file_path(self,
+                          source_file_path: Path) -> Path:
+        return self._intermediate_directory.path/f'{source_file_path.stem:s}.o'
+
+    def _object_file_is_up_to_date(self,
+                                   source_file_path: Path,
+                                   imported_module_interface_paths: list[Path] = []) -> bool:
+
+        # An object file is only up to date if it is newer than every prerequisite recorded in its depfile
+        object_file_path: Path = self._object_file_path(source_file_path)
+        depfile_path: Path = object_file_path.with_suffix('.d')
+        if not (object_file_path.exists() and depfile_path.exists()):
+            return False
+
+        object_modification_time: int = object_file_path.stat().st_mtime_ns
+        for prerequisite_path in read_depfile(depfile_path, self._repository_directory) + imported_module_interface_paths:
+            if not prerequisite_path.exists():
+                return False
+            if prerequisite_path.stat().st_mtime_ns > object_modification_time:
+                return False
+
+        return True
+
+    def _compile_action(self,
+                        source_file_path: Path,
+                        compilation_arguments: list[str],
+                        module_graph: ModuleGraph | None = None) -> BuildAction:
+
+        # Get the file path for the corresponding object file
+        object_file_path: Path = self._object_file_path(source_file_path)
+
+        # A module interface also produces its compiled interface, which every importer of the module takes as an input
+        module_name: str | None = module_graph.module_of(source_file_path) if module_graph else None
+        imported_modules: list[str] = module_graph.imported_modules_of(source_file_path) if module_graph else []
+
+        # The .dwo file is recorded under the name of the object file, which dwp resolves from wherever it runs,
+        # so the object file is named absolutely when its debug information will be packaged (possibly by a consumer),
+        # without resolving symlinks (a spilled intermediate file may be back in RAM by the time it is compiled)
+        formatted_object_file_path: str = \
+            str(object_file_path.absolute()) if self._package_debug_information else \
+            str(object_file_path.relative_to(self._repository_directory)) if object_file_path.is_relative_to(self._repository_directory) else str(object_file_path)  # noqa: E501
+
+        return BuildAction(COMPILE_ACTION,
+                           f'"{source_file_path.stem:s}" Compilation Results',
+                           [self._utility,
+                            '-c', str(source_file_path.relative_to(self._repository_directory)),
+                            '-o', formatted_object_file_path] +
+                           compilation_arguments,
+                           self._repository_directory,
+                           [source_file_path] + [self._module_interface_cache.module_interface_path(module) for module in imported_modules],  # noqa: E501
+                           [object_file_path] + ([self._module_interface_cache.module_interface_path(module_name)] if module_name else []),  # noqa: E501
+                           source_file_path)
+
+    def _link_actions(self,
+                      object_paths: list[Path],
+                      is_dynamic: bool | None) -> list[BuildAction]:
+
+        linked_dependencies: list[Dependency] = [dependency for dependency in self._dependencies if not dependency.is_header_only]  # noqa: E501
+        link_action: BuildAction
+
+        if is_dynamic is None:
+
+            # Get flags from each library directory per dependency
+            formatted_flags: list[str] = \
+                [f'L {str(dependency.library_path.parent):s}' for dependency in linked_dependencies] + \
+                [f'l{str(dependency.name                ):s}' for dependency in linked_dependencies]
+
+            # Keep the debug information compressed through the link
+            formatted_flags += [flag for flag in FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information] if flag == 'gz']
+
+            # Initialize the path for the to-be-compiled executable within the Binary directory
+            executable_path: Path = self._binary_directory/f'{self._name:s}.exe'
+
+            link_action = \
+                BuildAction(LINK_ACTION,
+                            'Linking Results',
+                            [self._utility,
+                             '-o', str(executable_path.relative_to(self._build_directory))] +
+                            [self._formatted_link_input(object_path) for object_path in object_paths] +
+                            flag_arguments(formatted_flags),
+                            self._build_directory,
+                            object_paths + [dependency.library_path for dependency in linked_dependencies],
+                            [executable_path])
 
-        # Initialize the Build directory
-        if not self._build_directory.exists():
-            self._build_directory.mkdir()
-            print(f'\nCreating Build Directory: {str(self._build_directory):s}\n')
+        else:
 
-        # Initialize variables for the upcoming for-loop
-        current_source_file_path: Path
-        current_object_file_path: Path
-        object_file_paths: list[Path] = []
+            # The library is named the same way as any other Dependency within the Library directory
+            library_path: Path = self._build_directory/'lib'/f'lib{self._name:s}.{library_extension(is_dynamic):s}'
+
+            # Create the flags for the object linking command based on libraries
+            linking_flags: list[str] = \
+                [f'L {str(dependency.library_path.parent):s}' for dependency in linked_dependencies] + \
+                [ f'l{str(dependency.library_path.name  ):s}' for dependency in linked_dependencies]      # noqa: E201, E202
+
+            # Add further flags based on library type
+            if is_dynamic:
+                linking_flags += ['shared']
+                if self._build_configuration == 'Release':
+                    linking_flags += ['s']
+                linking_flags += [flag for flag in FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information] if flag == 'gz']  # noqa: E501
+            else:
+                linking_flags += ['r', 'c', 's']
+
+            link_action = \
+                BuildAction(LINK_ACTION if is_dynamic else ARCHIVE_ACTION,
+                            'Creating Dynamic Library' if is_dynamic else 'Archiving into Static Library',
+                            [self._utility if is_dynamic else 'ar'] +
+                            flag_arguments(linking_flags) +
+                            ['-o', str(library_path.relative_to(self._build_directory))] +
+                            [self._formatted_link_input(object_path) for object_path in object_paths],
+                            self._build_directory,
+                            object_paths + [dependency.library_path for dependency in linked_dependencies],
+                            [library_path])
+
+        link_actions: list[BuildAction] = [link_action]
+
+        # Package the split debug information next to the executable or dynamic library if requested
+        # (static libraries cannot be, since they are never linked)
+        if self._package_debug_information and is_dynamic is not False:
+            link_actions.append(self._package_action(link_action.outputs[0]))
+
+        return link_actions
+
+    def _formatted_link_input(self,
+                              object_path: Path) -> str:
+
+        # Links run within the Build directory, so object files kept anywhere else (e.g., in RAM) are named absolutely,
+        # where ar and ld follow any symlink left behind by spilling when they run rather than when the build is planned
+        return object_path.name if object_path.parent == self._build_directory else str(object_path.absolute())
+
+    def _package_action(self,
+                        binary_path: Path) -> BuildAction:
+
+        # GDB looks for the package of an executable or library as '<file name>.dwp' right next to it,
+        # and dwp finds the .dwo files through the paths recorded at compile time, so it must run where the compiler ran
+        package_path: Path = binary_path.with_name(f'{binary_path.name:s}.dwp')
+
+        return BuildAction(PACKAGE_ACTION,
+                           'Packaging Debug Information',
+                           ['dwp', '-e', str(binary_path), '-o', str(package_path)],
+                           self._repository_directory,
+                           [binary_path],
+                           [package_path])
+
+    def _probed_toolchain(self) -> ToolchainProbe | None:
+
+        if self._probe_compiler and not self._toolchain_probe:
+            self._toolchain_probe = probe_toolchain(self._utility, self._toolchain_cache_path)
+
+        return self._toolchain_probe
+
+    def _check_compilation_flags(self) -> None:
+
+        # Make sure the compiler supports every chosen flag before anything is compiled
+        toolchain_probe: ToolchainProbe | None = self._probed_toolchain()
+        if toolchain_probe:
+            unsupported_flags: list[str] = toolchain_probe.unsupported_compilation_flags(self._compilation_flags())
+            if unsupported_flags:
+                raise ValueError(f'The following flags are not supported by {toolchain_probe.version:s} ({str(toolchain_probe.compiler_path):s}): {' '.join(flag_arguments(unsupported_flags)):s}')  # noqa: E501
+
+    def _check_linking_flags(self,
+                             is_dynamic: bool | None) -> None:
+
+        # Make sure the linker supports every flag it will be given, unless archiving a static library
+        toolchain_probe: ToolchainProbe | None = self._probed_toolchain() if is_dynamic is not False else None
+        if toolchain_probe:
+            linking_flags: list[str] = \
+                (['shared'] + (['s'] if self._build_configuration == 'Release' else []) if is_dynamic else []) + \
+                [flag for flag in FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information] if flag == 'gz']
+            unsupported_flags: list[str] = toolchain_probe.unsupported_linking_flags(linking_flags)
+            if unsupported_flags:
+                raise ValueError(f'The following flags are not supported by the linker of {toolchain_probe.version:s} ({str(toolchain_probe.compiler_path):s}): {' '.join(flag_arguments(unsupported_flags)):s}')  # noqa: E501
+
+    def plan(self,
+             is_dynamic: bool | None = None) -> BuildPlan:
+
+        # Planning only reads the Source directory (and module declarations), and never runs or writes anything
+        compilation_arguments: list[str] = self._compilation_arguments()
+
+        # If using modules, order the source files such that every module interface is compiled before its importers
+        source_file_paths: list[Path] = self._source_file_paths()
+        module_graph: ModuleGraph | None = None
+        if self._modules:
+            module_graph = ModuleGraph(source_file_paths)
+            source_file_paths = module_graph.ordered_source_file_paths()
+
+        compile_actions: list[BuildAction] = \
+            [self._compile_action(source_file_path, compilation_arguments, module_graph) for source_file_path in source_file_paths]  # noqa: E501
+
+        return BuildPlan(self._name,
+                         compile_actions + self._link_actions([compile_action.outputs[0] for compile_action in compile_actions], is_dynamic),  # noqa: E501
+                         module_graph)
+
+    def _run_action(self,
+                    action: BuildAction) -> subprocess.CompletedProcess[bytes]:
+
+        if self._job_pool:
+            return self._job_pool.submit(self._run_command,
+                                         action.description,
+                                         list(action.arguments),
+                                         action.working_directory,
+                                         action.source_file_path).result()
+
+        return self._run_command(action.description,
+                                 list(action.arguments),
+                                 action.working_directory,
+                                 action.source_file_path)
+
+    def _compile_source_file(self,
+                             compile_action: BuildAction,
+                             compilation_flags: str) -> Path:
+
+        source_file_path: Path = compile_action.source_file_path
+        object_file_path: Path = compile_action.outputs[0]
+
+        # Remove any previous object file first, since it may be hardlinked to an object file of another build
+        self._intermediate_directory.remove(object_file_path)
+        self._intermediate_directory.reserve([object_file_path.with_suffix(suffix) for suffix in ['.o', '.d', '.dwo']])
+
+        def compile_object_file() -> None:
+
+            # Compile the source file
+            compilation_results: subprocess.CompletedProcess[bytes] = self._run_action(compile_action)
+
+            # Both the '-ftime-report' table and the '-H' include trace are written to stderr
+            if self._profile_report:
+                self._profile_report.add_profile(CompilationProfile(source_file_path,
+                                                                    compilation_results.stderr.decode('utf-8'),
+                                                                    self._repository_directory))
+
+        # Reuse an identical object file compiled by another build if there is one
+        if self._object_cache:
+            start_time: float = time.perf_counter()
+            if self._object_cache.retrieve_or_compile(ObjectCache.key(self._utility, compilation_flags, source_file_path),
+                                                      object_file_path,
+                                                      compile_object_file,
+                                                      self._repository_directory):
+                self._record_cache_hit(f'"{source_file_path.stem:s}" Reused From Object Cache',
+                                       source_file_path,
+                                       time.perf_counter() - start_time)
+        else:
+            compile_object_file()
 
-        # Initialize the compile command
-        compile_command: str = '{utility:s} -c {input_source:s} -o {output_object:s} {compilation_flags:s}'
+        # Keep track of the size of the intermediate files, spilling them onto disk once the size cap is hit
+        self._intermediate_directory.store([object_file_path.with_suffix(suffix) for suffix in ['.o', '.d', '.dwo']])
 
-        # Walk through the Source directory and compile each individual source file
-        for root, _, files in self._source_directory.walk():
-            for file in files:
+        return object_file_path
 
-                # Get the file paths for the source file and corresponding object file
-                current_source_file_path = root/file
-                current_object_file_path = self._build_directory/f'{current_source_file_path.stem:s}.o'
+    def _generate_object_files(self,
+                               build_plan: BuildPlan) -> list[Path]:
 
-                # If the source code file is C/C++,...
-                if current_source_file_path.suffix in self._source_code_extensions:
+        print(self)
 
-                    # ..., then compile it
-                    run_command(f'"{current_source_file_path.stem:s}" Compilation Results',
-                                compile_command.format(utility=self._utility,
-                                                       input_source=str(current_source_file_path.relative_to(self._repository_directory)),   # noqa: E501
-                                                       output_object=str(current_object_file_path.relative_to(self._repository_directory)),  # noqa: E501
-                                                       compilation_flags=' '.join([f'-{flag:s}' for flag in formatted_flags])),              # noqa: E501
-                                self._repository_directory)
+        # Get flags from the compilation settings
+        compilation_flags: str = self._formatted_compilation_flags()
 
-                    object_file_paths.append(current_object_file_path)
+        # Initialize the profiling report for this build if profiling
+        if self._profile:
+            self._profile_report = ProfileReport()
 
-        return object_file_paths
+        # Initialize the Build directory
+        if not self._build_directory.exists():
+            self._build_directory.mkdir(parents=True)
+            print(f'\nCreating Build Directory: {str(self._build_directory):s}\n')
 
-    def generate_as_executable(self) -> None:
+        # Every object file is compiled again if not building incrementally, so nothing left over in RAM is worth keeping
+        if not self._incremental:
+            self._intermediate_directory.clean()
+        self._intermediate_directory.create()
+
+        # If building incrementally, any change to the compilation flags invalidates every existing object file
+        flags_are_unchanged: bool = False
+        if self._incremental:
+            flags_file_path: Path = self._build_directory/'compilation_flags.txt'
+            flags_are_unchanged = flags_file_path.read_text() == compilation_flags if flags_file_path.exists() else False  # noqa: E501
+            flags_file_path.write_text(compilation_flags)
+
+        # If using modules, the plan is already ordered, but the mapper file still needs to point at every module
+        module_graph: ModuleGraph | None = build_plan.module_graph
+        if module_graph:
+            self._module_interface_cache.write_module_mapper(module_graph.module_names)
+
+        # Compile each individual source file, skipping those that are already up to date if building incrementally,
+        # where source files are compiled concurrently if there is a job pool to share (every compilation waits on the
+        # pool, or on the object cache, within a thread of its own, so that the pool itself only ever runs the compiler)
+        object_file_paths: list[Path | Future[Path]] = []
+        stamp_per_module: dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) if self._job_pool else contextlib.nullcontext() as compilation_executor:  # noqa: E501
+            for compile_action in build_plan.compile_actions:
+
+                source_file_path: Path = compile_action.source_file_path
+                module_name: str | None = module_graph.module_of(source_file_path) if module_graph else None
+                imported_modules: list[str] = module_graph.imported_modules_of(source_file_path) if module_graph else []
+
+                # Module interfaces are reused from the cache whenever they and everything they import are unchanged
+                if module_name:
+
+                    stamp: str = self._module_interface_cache.stamp(module_name,
+                                                                    compilation_flags,
+                                                                    source_file_path,
+                                                                    [stamp_per_module[module] for module in imported_modules])
+
+                    if self._module_interface_cache.is_up_to_date(module_name, stamp):
+                        self._module_interface_cache.restore(module_name, compile_action.outputs[0])
+                        self._record_cache_hit(f'"{source_file_path.stem:s}" Reused Module Interface', source_file_path, 0.0)  # noqa: E501
+                        object_file_paths.append(compile_action.outputs[0])
+                    else:
+                        object_file_paths.append(self._compile_source_file(compile_action, compilation_flags))
+                        self._module_interface_cache.store(module_name, object_file_paths[-1])
+                        self._intermediate_directory.store(self._module_interface_cache.cached_file_paths(module_name))
+                        stamp = self._module_interface_cache.stamp(module_name,
+                                                                   compilation_flags,
+                                                                   source_file_path,
+                                                                   [stamp_per_module[module] for module in imported_modules])
+                        self._module_interface_cache.write_stamp(module_name, stamp)
+
+                    stamp_per_module[module_name] = stamp
+
+                elif flags_are_unchanged and \
+                    self._object_file_is_up_to_date(source_file_path,
+                                                    list(compile_action.inputs[1:])):
+                    self._record_cache_hit(f'"{source_file_path.stem:s}" Already Up To Date', source_file_path, 0.0)
+                    object_file_paths.append(compile_action.outputs[0])
+
+                else:
+                    object_file_paths.append(compilation_executor.submit(self._compile_source_file, compile_action, compilation_flags) if compilation_executor else self._compile_source_file(compile_action, compilation_flags))  # noqa: E501
+
+        # Every concurrent compilation has finished by now, where the first one to fail is reported
+        object_file_paths = [object_file_path.result() if isinstance(object_file_path, Future) else object_file_path for object_file_path in object_file_paths]  # noqa: E501
+
+        if self._profile_report:
+            print(self._profile_report)
 
-        # Generate and retrieve the object file paths
-        object_paths: list[Path] = self._generate_object_files()
+        return object_file_paths
+
+    def _link_as_executable(self,
+                            link_actions: list[BuildAction]) -> None:
 
-        # Get flags from each library directory per dependency
-        formatted_flags = \
-            [f'L {str(dependency.library_path.parent):s}' for dependency in self._dependencies if not dependency.is_header_only] + \
-            [f'l{str(dependency.name                ):s}' for dependency in self._dependencies if not dependency.is_header_only]
+        link_action: BuildAction = link_actions[0]
 
         # Initialize the Binary directory
         if not self._binary_directory.exists():
             self._binary_directory.mkdir()
             print(f'\nCreating Binary Directory: {str(self._binary_directory):s}\n')
 
-        # Initialize the path for the to-be-compiled executable within the Binary directory
-        executable_path: Path = self._binary_directory/f'{self._name:s}.exe'
-
-        # Initialize the command for the executable creation
-        link_command: str = '{utility:s} -o {output_executable:s} {input_objects:s} {linking_flags:s}'
+        # If building incrementally, skip relinking when none of the inputs of the executable have changed
+        if self._skip_link_if_up_to_date(link_action):
+            return
 
         # Run the object linking command within the Build Directory
-        run_command('Linking Results',
-                    link_command.format(utility=self._utility,
-                                        output_executable=str(executable_path.relative_to(self._build_directory)),
-                                        input_objects=' '.join([object_path.name for object_path in object_paths]),
-                                        linking_flags=' '.join([f'-{flag:s}' for flag in formatted_flags])),
-                    self._build_directory)
-
-        # Remove the object files afterwards
-        for object_path in object_paths:
-            Path.unlink(object_path)
+        self._run_action(link_action)
+        self._write_link_stamp(link_action)
 
-    def generate_as_dependency(self,
-                               is_dynamic: bool) -> Dependency:
+        # Package the split debug information next to the executable if requested
+        for package_action in link_actions[1:]:
+            self._run_action(package_action)
+
+    def _link_as_dependency(self,
+                            link_actions: list[BuildAction],
+                            is_dynamic: bool) -> Dependency:
 
-        # Generate and retrieve the object file paths
-        object_paths: list[Path] = self._generate_object_files()
+        link_action: BuildAction = link_actions[0]
 
         # Initialize the Library Directory
-        library_directory: Path = self._build_directory/'lib'
+        library_directory: Path = link_action.outputs[0].parent
         if not library_directory.exists():
             library_directory.mkdir()
             print(f'\nCreating Library Directory: {str(library_directory):s}\n')
@@ -292,33 +745,295 @@ class CodeBase:
                        is_dynamic,
                        library_directory)
 
-        # Create the flags for the object linking command based on libraries
-        linking_flags = \
-            [f'L {str(dependency.library_path.parent):s}' for dependency in self._dependencies if not dependency.is_header_only] + \
-            [ f'l{str(dependency.library_path.name  ):s}' for dependency in self._dependencies if not dependency.is_header_only]      # noqa: E201, E202
+        # If building incrementally, only the members of an existing static library which changed are replaced
+        if not is_dynamic and self._incremental and codebase_as_dependency.library_path.exists():
+            self._update_static_library(codebase_as_dependency.library_path, self._linked_object_paths(link_action))
+            return codebase_as_dependency
 
-        # Add further flags based on library type
-        if is_dynamic:
-            linking_flags += ['shared']
-            if self._build_configuration == 'Release':
-                linking_flags += ['s']
-        else:
-            linking_flags += ['r', 'c', 's']
+        # Otherwise, a static library is recreated from scratch, so that it holds no members left over from a previous build
+        if not is_dynamic and codebase_as_dependency.library_path.exists():
+            Path.unlink(codebase_as_dependency.library_path)
 
-        # Initialize the command for the library creation
-        create_command: str = '{utility:s} {linking_flags:s} -o {output_library:s} {input_objects:s}'
+        # If building incrementally, skip relinking a dynamic library when none of its inputs have changed
+        if is_dynamic and self._skip_link_if_up_to_date(link_action):
+            return codebase_as_dependency
 
         # Run the library creation command within the Build Directory
-        run_command('Creating Dynamic Library' if is_dynamic else 'Archiving into Static Library',
-                    create_command.format(utility=self._utility if is_dynamic else 'ar',
-                                          output_library=str(codebase_as_dependency.library_path.relative_to(self._build_directory)),  # noqa: E501
-                                          input_objects=' '.join([object_path.name for object_path in object_paths]),
-                                          linking_flags=' '.join([f'-{flag:s}' for flag in linking_flags])),
-                    self._build_directory)
-
-        # Remove the object files afterwards
+        self._run_action(link_action)
+        if is_dynamic:
+            self._write_link_stamp(link_action)
+
+        # Package the split debug information next to the dynamic library if requested
+        for package_action in link_actions[1:]:
+            self._run_action(package_action)
+
+        return codebase_as_dependency
+
+    def _linked_object_paths(self,
+                             link_action: BuildAction) -> list[Path]:
+
+        # The inputs of a link are its object files followed by the libraries of its dependencies
+        return [input_path for input_path in link_action.inputs if input_path.suffix == '.o']
+
+    def _link_stamp_path(self,
+                         output_path: Path) -> Path:
+        return self._build_directory/f'{output_path.name:s}.link'
+
+    def _hash_link_inputs(self,
+                          link_action: BuildAction) -> str:
+        return hash_link_inputs(link_action.command,
+                                self._linked_object_paths(link_action),
+                                [(dependency.library_path, dependency.is_dynamic) for dependency in self._dependencies if not dependency.is_header_only])  # noqa: E501
+
+    def _skip_link_if_up_to_date(self,
+                                 link_action: BuildAction) -> bool:
+
+        # A link is only skipped when the command, every object file, and every library it links against are unchanged,
+        # where a shared library counts as unchanged as long as its exported symbol table is
+        if self._incremental and link_is_up_to_date(link_action.outputs[0],
+                                                    self._link_stamp_path(link_action.outputs[0]),
+                                                    self._hash_link_inputs(link_action)):
+            print(f'\n{link_action.description:s}: Skipped, {link_action.outputs[0].name:s} is already up to date\n')
+            self._record_cache_hit(f'{link_action.description:s} Skipped', None, 0.0)
+            return True
+
+        return False
+
+    def _write_link_stamp(self,
+                          link_action: BuildAction) -> None:
+
+        if self._incremental:
+            self._link_stamp_path(link_action.outputs[0]).write_text(self._hash_link_inputs(link_action))
+
+    def _update_static_library(self,
+                               library_path: Path,
+                               object_paths: list[Path]) -> None:
+
+        # Find the members which no longer have an object file, and the object files which are newer than the library
+        library_modification_time: int = library_path.stat().st_mtime_ns
+        members: list[str] = list_archive_members(library_path)
+        stale_members: list[str] = [member for member in members if member not in [object_path.name for object_path in object_paths]]  # noqa: E501
+        changed_object_paths: list[Path] = \
+            [object_path for object_path in object_paths if object_path.name not in members or object_path.stat().st_mtime_ns > library_modification_time]  # noqa: E501
+
+        # Leave the library (and its modification time) untouched if nothing changed, so that nothing downstream relinks
+        if not (stale_members or changed_object_paths):
+            print(f'\nArchiving into Static Library: Skipped, {library_path.name:s} is already up to date\n')
+            self._record_cache_hit('Archiving into Static Library Skipped', None, 0.0)
+            return
+
+        if stale_members:
+            self._run_command('Removing Stale Members from Static Library',
+                              ['ar', '-d', '-s', str(library_path.relative_to(self._build_directory))] + stale_members,
+                              self._build_directory)
+
+        if changed_object_paths:
+            self._run_command('Replacing Changed Members of Static Library',
+                              ['ar', '-r', '-c', '-s', str(library_path.relative_to(self._build_directory))] + [self._formatted_link_input(object_path) for object_path in changed_object_paths],  # noqa: E501
+                              self._build_directory)
+
+    def _run_command(self,
+                     command_description: str,
+                     command: str | list[str],
+                     working_directory: Path,
+                     source_file_path: Path | None = None) -> subprocess.CompletedProcess[bytes]:
+
+        results: subprocess.CompletedProcess[bytes] | None = None
+        start_time: float = time.perf_counter()
+
+        try:
+            results = run_command(command_description,
+                                  command,
+                                  working_directory)
+
+        except CommandFailure as failure:
+            results = failure.results
+            raise
+
+        finally:
+            with self._command_duration_lock:
+                self._command_duration += time.perf_counter() - start_time
+
+            # Record the command in the build history if this build is being recorded
+            if self._build_record:
+                self._build_record.add_command(CommandRecord(command_description,
+                                                             shlex.join(command) if isinstance(command, list) else command,
+                                                             source_file_path,
+                                                             time.perf_counter() - start_time,
+                                                             results.returncode if results else -1,
+                                                             len(results.stdout) + len(results.stderr) if results else 0,  # noqa: E501
+                                                             False))
+
+        return results
+
+    def _record_cache_hit(self,
+                          description: str,
+                          source_file_path: Path | None,
+                          duration: float) -> None:
+
+        if self._build_record:
+            self._build_record.add_command(CommandRecord(description,
+                                                         '',
+                                                         source_file_path,
+                                                         duration,
+                                                         0,
+                                                         0,
+                                                         True))
+
+    def start_build_record(self,
+                           is_partial: bool = False) -> None:
+
+        # Builds driven through compile() and link() directly (e.g., by a watch-mode build server) are recorded too,
+        # by starting and finishing their record around them
+        self._command_duration = 0.0
+
+        if self._build_database_path:
+            self._build_record = \
+                BuildRecord(self._name,
+                            self._repository_directory,
+                            self._build_directory,
+                            get_current_commit(self._repository_directory),
+                            hashlib.sha256(f'{self._utility:s}\0{self._formatted_compilation_flags():s}'.encode('utf-8')).hexdigest(),  # noqa: E501
+                            is_partial)
+
+    def finish_build_record(self,
+                            succeeded: bool) -> None:
+
+        # Append the build, whether it succeeded or not, to the build history
+        if self._build_record:
+            self._build_record.finish(succeeded)
+            BuildDatabase(self._build_database_path).record_build(self._build_record)
+            self._build_record = None
+
+    def _remove_intermediate_files(self,
+                                   object_paths: list[Path],
+                                   debug_information_is_packaged: bool) -> None:
+
+        # Object files (and their depfiles) are kept around between builds when building incrementally
+        if not self._incremental:
+            self.remove_object_files(object_paths, debug_information_is_packaged)
+
+            # Nothing is left within a RAM-backed directory that is worth its memory (e.g., compiled module interfaces),
+            # unless it holds the split debug information which the debugger still needs
+            if debug_information_is_packaged or 'gsplit-dwarf' not in FLAGS_PER_DEBUG_INFORMATION_MODE[self._debug_information]:  # noqa: E501
+                self._intermediate_directory.clean()
+
+    def compile(self,
+                build_plan: BuildPlan,
+                source_file_paths: list[Path] | None = None) -> list[Path]:
+
+        self._check_compilation_flags()
+
+        # Compile whatever is out of date within the plan, the same way as a full build does
+        if source_file_paths is None:
+            return self._generate_object_files(build_plan)
+
+        # Otherwise, compile exactly the given source files (e.g., those which a file watcher saw change), which is not
+        # possible with modules, since every compiled module interface has to be kept in step with its importers
+        if self._modules:
+            raise ValueError(f'The \'{self._name:s}\' code base uses modules, so only its whole plan can be compiled at once')  # noqa: E501
+
+        compile_action_per_source: dict[Path, BuildAction] = \
+            {compile_action.source_file_path.resolve(): compile_action for compile_action in build_plan.compile_actions}
+
+        object_file_paths: list[Path] = []
+        compilation_flags: str = self._formatted_compilation_flags()
+        for source_file_path in source_file_paths:
+            if source_file_path.resolve() not in compile_action_per_source:
+                raise ValueError(f'The following source file is not part of the \'{build_plan.name:s}\' build plan: {str(source_file_path):s}')  # noqa: E501
+            object_file_paths.append(self._compile_source_file(compile_action_per_source[source_file_path.resolve()], compilation_flags))  # noqa: E501
+
+        return object_file_paths
+
+    def link(self,
+             build_plan: BuildPlan,
+             is_dynamic: bool | None = None) -> Dependency | None:
+
+        self._check_linking_flags(is_dynamic)
+
+        # Link the object files of the plan into the executable, or link (or archive) them into the library
+        if is_dynamic is None:
+            self._link_as_executable(build_plan.link_actions)
+            return None
+
+        return self._link_as_dependency(build_plan.link_actions, is_dynamic)
+
+    def remove_intermediate_directory(self) -> None:
+
+        # Free the RAM-backed directory (e.g., before removing the Build directory), since it lives outside of it
+        self._intermediate_directory.clean()
+
+    def remove_object_files(self,
+                            object_paths: list[Path],
+                            remove_split_debug_information: bool = True) -> None:
+
         for object_path in object_paths:
-            Path.unlink(object_path)
+            self._intermediate_directory.remove(object_path)
+
+            # Depfiles are only written outside of incremental builds to keep module interfaces cached
+            self._intermediate_directory.remove(object_path.with_suffix('.d'))
+
+            # Split debug information is still needed by the debugger (and by whatever links a static library),
+            # unless it was packaged into a .dwp file
+            if remove_split_debug_information:
+                self._intermediate_directory.remove(object_path.with_suffix('.dwo'))
+
+    def generate_as_executable(self) -> None:
+
+        self.start_build_record()
+        succeeded: bool = False
+
+        try:
+
+            # Make sure the compiler (and linker) support every chosen flag before anything is built
+            self._check_compilation_flags()
+            self._check_linking_flags(None)
+
+            # Plan every action of the build before running any of them
+            build_plan: BuildPlan = self.plan()
+
+            # Generate and retrieve the object file paths
+            object_paths: list[Path] = self.compile(build_plan)
+
+            # Link the object files into the executable
+            self.link(build_plan)
+
+            # Remove the object files afterwards
+            self._remove_intermediate_files(object_paths, self._package_debug_information)
+
+            succeeded = True
+
+        finally:
+            self.finish_build_record(succeeded)
+
+    def generate_as_dependency(self,
+                               is_dynamic: bool) -> Dependency:
+
+        self.start_build_record()
+        succeeded: bool = False
+
+        try:
+
+            # Make sure the compiler (and linker) support every chosen flag before anything is built
+            self._check_compilation_flags()
+            self._check_linking_flags(is_dynamic)
+
+            # Plan every action of the build before running any of them
+            build_plan: BuildPlan = self.plan(is_dynamic)
+
+            # Generate and retrieve the object file paths
+            object_paths: list[Path] = self.compile(build_plan)
+
+            # Link or archive the object files into the library
+            codebase_as_dependency: Dependency = self._link_as_dependency(build_plan.link_actions, is_dynamic)
+
+            # Remove the object files afterwards
+            self._remove_intermediate_files(object_paths, self._package_debug_information and is_dynamic)
+
+            succeeded = True
+
+        finally:
+            self.finish_build_record(succeeded)
 
         return codebase_as_dependency
 
@@ -326,6 +1041,18 @@ class CodeBase:
                        new_dependency: Dependency) -> None:
         self._dependencies.append(new_dependency)
 
+    def _stage_dynamic_libraries(self) -> list[Path]:
+
+        # Stage any .dll/.so files in the Binary directory for testing
+        staged_library_paths: list[Path] = []
+        for dependency in self._dependencies:
+            if not dependency.is_header_only and dependency.is_dynamic:
+                staged_library_paths.append(self._binary_directory/dependency.library_path.name)
+                stage_file(dependency.library_path,
+                           staged_library_paths[-1])
+
+        return staged_library_paths
+
     def test_executable(self) -> None:
 
         # Initialize the compiled executable path (within the Build directory)
@@ -334,14 +1061,28 @@ class CodeBase:
         # If the executable has already been compiled,...
         if executable_path.exists():
 
-            # Move any .dll/.so files to the Binary directory for testing
-            for dependency in self._dependencies:
-                if dependency.is_dynamic:
-                    shutil.copyfile(dependency.library_path,
-                                    self._binary_directory/dependency.library_path.name)
+            self._stage_dynamic_libraries()
 
             # Actually test the executable
             run_command('Testing Executable',
                         f'{executable_path.stem:s}.exe',
                         self._binary_directory)
-            
+
+    def test_executables(self,
+                         argument_sets: list[list[str]] = [[]],
+                         timeout: float = 60.0,
+                         jobs: int | None = None,
+                         rerun_all: bool = False) -> list[TestResult]:
+
+        staged_library_paths: list[Path] = self._stage_dynamic_libraries()
+
+        # Run every executable within the Binary directory once per argument set, skipping those which already passed
+        test_runner: TestRunner = \
+            TestRunner(discover_test_cases(self._binary_directory,
+                                           argument_sets,
+                                           timeout,
+                                           staged_library_paths),
+                       self._build_directory/'test_results.json',
+                       jobs)
+
+        return test_runner.run(rerun_all)
@@ -1,25 +1,59 @@
+import shlex
 import subprocess
 from pathlib import Path
 
 
+class CommandFailure(Exception):
+
+    def __init__(self,
+                 message: str,
+                 results: subprocess.CompletedProcess[bytes]) -> None:
+
+        super().__init__(message)
+        self._results: subprocess.CompletedProcess[bytes] = results
+
+    @property
+    def results(self) -> subprocess.CompletedProcess[bytes]:
+        return self._results
+
+
 def run_command(command_description: str,
-                command: str,
+                command: str | list[str],
                 working_directory: Path | None = None,
-                successful_return_code: int = 0) -> None:
+                successful_return_code: int = 0) -> subprocess.CompletedProcess[bytes]:
 
-    results: subprocess.CompletedProcess[bytes] = \
-            subprocess.run(command,
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE,
-                           cwd=working_directory,
-                           shell=True) if working_directory else subprocess.run(command,
-                                                                                stdout=subprocess.PIPE,
-                                                                                stderr=subprocess.PIPE)
+    # A list of arguments is run as is, without going through a shell (whose quoting differs between platforms, e.g.,
+    # cmd.exe on Windows), and is only joined into a single string for display
+    results: subprocess.CompletedProcess[bytes]
+    if isinstance(command, list):
+
+        # Without a shell to report it, a missing (or non-executable) program raises instead of failing the command,
+        # so the error is reported as the results of the command, as the shell would (i.e., return code 127)
+        try:
+            results = subprocess.run(command,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE,
+                                     cwd=working_directory)
+        except OSError as error:
+            results = subprocess.CompletedProcess(command,
+                                                  127,
+                                                  b'',
+                                                  str(error).encode('utf-8'))
+
+    else:
+        results = subprocess.run(command,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 cwd=working_directory,
+                                 shell=True) if working_directory else subprocess.run(command,
+                                                                                      stdout=subprocess.PIPE,
+                                                                                      stderr=subprocess.PIPE)
+    formatted_command: str = shlex.join(command) if isinstance(command, list) else command
 
     success: bool = results.returncode == successful_return_code
 
     formatted_results: list[str] = [f'\tWorking directory: {str(working_directory):s}'] if working_directory else []
-    formatted_results.append(f'\tCommand: {command:s}')
+    formatted_results.append(f'\tCommand: {formatted_command:s}')
     if results.stdout:
         formatted_results.append(f'\tOutput:\n\n{results.stdout.decode('utf-8'):s}')
     if results.stderr:
@@ -31,4 +65,6 @@ def run_command(command_description: str,
     if success:
         print(msg)
     else:
-        raise Exception('\n' + msg)
+        raise CommandFailure('\n' + msg, results)
+
+    return results
@@ -4,6 +4,13 @@ FLAGS_PER_BUILD_CONFIGURATION: dict[str, list[str]] = \
     {'Debug': ['ggdb'],
      'Release': ['O2', 'DNDEBUG']}
 
+# https://gcc.gnu.org/onlinedocs/gcc/Debugging-Options.html
+FLAGS_PER_DEBUG_INFORMATION_MODE: dict[str, list[str]] = \
+    {'Full': [],
+     'Split DWARF': ['gsplit-dwarf'],
+     'Compressed': ['gz'],
+     'Split and Compressed DWARF': ['gsplit-dwarf', 'gz']}
+
 # https://www.learncpp.com/cpp-tutorial/configuring-your-compiler-choosing-a-language-standard/
 C_PLUS_PLUS_LANGUAGE_STANDARDS: list[str] = ['0x', '1y', '1z',  '2a', '2b']
 C_LANGUAGE_STANDARDS: list[int] = [1989, 1990, 1999, 2011, 2018]
@@ -14,6 +21,9 @@ C_PLUS_PLUS_HEADER_EXTENSIONS: list[str] = ['.h', '.hpp']
 C_SOURCE_CODE_EXTENSIONS: list[str] = ['.c']
 C_HEADER_EXTENSIONS: list[str] = ['.h']
 
+# https://gcc.gnu.org/onlinedocs/gcc/Preprocessor-Options.html
+DEPENDENCY_TRACKING_FLAGS: list[str] = ['MMD', 'MP']
+
 # https://www.learncpp.com/cpp-tutorial/configuring-your-compiler-compiler-extensions/
 FLAG_PER_MISCELLANEOUS_DECISION: dict[str, str] = \
     {'Disable Compiler Extensions': 'pedantic-errors'}
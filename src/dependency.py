@@ -2,6 +2,19 @@ import platform
 from pathlib import Path
 
 
+def library_extension(is_dynamic: bool) -> str:
+
+    extension: str
+
+    match platform.system():
+        case 'Windows':
+            extension = 'dll' if is_dynamic else 'lib'
+        case _:
+            extension = 'so' if is_dynamic else 'a'
+
+    return extension
+
+
 class Dependency:
 
     def __init__(self,
@@ -56,15 +69,7 @@ class Dependency:
         if self._is_header_only:
             raise Exception(f'The \'{self._name:s}\' Dependency is a header-only library, it doesn\'t make sense to ask for the Library file extension.')  # noqa: E501
 
-        extension: str
-
-        match platform.system():
-            case 'Windows':
-                extension = 'dll' if self.is_dynamic else 'lib'
-            case _:
-                extension = 'so' if self.is_dynamic else 'a'
-
-        return extension
+        return library_extension(self.is_dynamic)
 
     @property
     def library_path(self) -> Path:
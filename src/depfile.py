@@ -0,0 +1,18 @@
+import re
+from pathlib import Path
+
+
+def read_depfile(depfile_path: Path,
+                 working_directory: Path) -> list[Path]:
+
+    # Only the first rule of a depfile lists the prerequisites, any other rules are the phony targets added by '-MP'
+    first_rule: str = depfile_path.read_text().replace('\\\n', ' ').splitlines()[0]
+    prerequisites: str = re.split(r':(?:\s|$)', first_rule, maxsplit=1)[1]
+
+    prerequisite_paths: list[Path] = []
+    for prerequisite in re.split(r'(?<!\\)\s+', prerequisites.strip()):
+        if prerequisite:
+            prerequisite_path: Path = Path(prerequisite.replace('\\ ', ' ').replace('$$', '$'))
+            prerequisite_paths.append(prerequisite_path if prerequisite_path.is_absolute() else working_directory/prerequisite_path)  # noqa: E501
+
+    return prerequisite_paths
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import shlex
+import hashlib
+import platform
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from staging import hash_file
+
+
+TEST_STATUSES: list[str] = ['Passed', 'Failed', 'Timed Out', 'Unchanged']
+
+
+class TestCase:
+
+    def __init__(self,
+                 executable_path: Path,
+                 arguments: list[str] = [],
+                 timeout: float = 60.0,
+                 library_paths: list[Path] = []) -> None:
+
+        self._executable_path: Path = executable_path
+        self._arguments: list[str] = arguments
+        self._timeout: float = timeout
+        self._library_paths: list[Path] = library_paths
+
+    def __str__(self) -> str:
+        return shlex.join([str(self._executable_path)] + self._arguments)
+
+    @property
+    def executable_path(self) -> Path:
+        return self._executable_path
+
+    @property
+    def arguments(self) -> list[str]:
+        return self._arguments
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def library_paths(self) -> list[Path]:
+        return self._library_paths
+
+    def fingerprint(self,
+                    hash_per_path: dict[Path, str] = {}) -> str:
+
+        def hash_path(file_path: Path) -> str:
+            return hash_per_path[file_path] if file_path in hash_per_path else hash_file(file_path)
+
+        # A test only needs to run again if its executable, its arguments, or a library it loads has changed
+        fingerprint_hash = hashlib.sha256()
+        for field in [str(self)] + [hash_path(self._executable_path)] + \
+                     [f'{str(library_path):s}\0{hash_path(library_path):s}' for library_path in self._library_paths]:
+            fingerprint_hash.update(f'{field:s}\0'.encode('utf-8'))
+
+        return fingerprint_hash.hexdigest()
+
+
+class TestResult:
+
+    def __init__(self,
+                 test_case: TestCase,
+                 status: str,
+                 duration: float,
+                 return_code: int | None = None,
+                 output: str = '') -> None:
+
+        if status not in TEST_STATUSES:
+            raise ValueError(f'The following test status is not recognized: {status:s}')
+
+        self._test_case: TestCase = test_case
+        self._status: str = status
+        self._duration: float = duration
+        self._return_code: int | None = return_code
+        self._output: str = output
+
+    @property
+    def test_case(self) -> TestCase:
+        return self._test_case
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def return_code(self) -> int | None:
+        return self._return_code
+
+    @property
+    def output(self) -> str:
+        return self._output
+
+    @property
+    def succeeded(self) -> bool:
+        return self._status in ['Passed', 'Unchanged']
+
+
+def discover_test_cases(directory: Path,
+                        argument_sets: list[list[str]] = [[]],
+                        timeout: float = 60.0,
+                        library_paths: list[Path] = []) -> list[TestCase]:
+
+    # Every executable below the directory is run once per argument set
+    return [TestCase(executable_path,
+                     arguments,
+                     timeout,
+                     library_paths) for executable_path in sorted(directory.rglob('*.exe')) for arguments in argument_sets]  # noqa: E501
+
+
+class TestRunner:
+
+    def __init__(self,
+                 test_cases: list[TestCase],
+                 state_path: Path,
+                 jobs: int | None = None) -> None:
+
+        self._test_cases: list[TestCase] = test_cases
+        self._state_path: Path = state_path
+
+        self._jobs: int = jobs if jobs else (os.cpu_count() or 1)
+        if self._jobs < 1:
+            raise ValueError('The test runner needs a job budget of at least 1')
+
+    @property
+    def test_cases(self) -> list[TestCase]:
+        return self._test_cases
+
+    @property
+    def state_path(self) -> Path:
+        return self._state_path
+
+    def _read_passing_fingerprints(self) -> dict[str, str]:
+        return json.loads(self._state_path.read_text()) if self._state_path.exists() else {}
+
+    def _run_test_case(self,
+                       test_case: TestCase,
+                       passing_fingerprint: str | None,
+                       hash_per_path: dict[Path, str]) -> tuple[TestResult, str]:
+
+        fingerprint: str = test_case.fingerprint(hash_per_path)
+        if fingerprint == passing_fingerprint:
+            return (TestResult(test_case, 'Unchanged', 0.0),
+                    fingerprint)
+
+        # Dynamic libraries are staged next to the executable, which Windows searches by default but Linux does not
+        environment: dict[str, str] = dict(os.environ)
+        if platform.system() != 'Windows':
+            environment['LD_LIBRARY_PATH'] = \
+                os.pathsep.join([str(test_case.executable_path.parent.resolve())] + [str(library_path.parent.resolve()) for library_path in test_case.library_paths] +  # noqa: E501
+                                ([environment['LD_LIBRARY_PATH']] if environment.get('LD_LIBRARY_PATH') else []))
+
+        start_time: float = time.perf_counter()
+
+        try:
+            results: subprocess.CompletedProcess[bytes] = \
+                subprocess.run([str(test_case.executable_path.resolve())] + test_case.arguments,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT,
+                               cwd=test_case.executable_path.parent,
+                               env=environment,
+                               timeout=test_case.timeout)
+
+        except subprocess.TimeoutExpired as timeout:
+            return (TestResult(test_case,
+                               'Timed Out',
+                               time.perf_counter() - start_time,
+                               None,
+                               timeout.output.decode('utf-8', errors='replace') if timeout.output else ''),
+                    fingerprint)
+
+        return (TestResult(test_case,
+                           'Passed' if results.returncode == 0 else 'Failed',
+                           time.perf_counter() - start_time,
+                           results.returncode,
+                           results.stdout.decode('utf-8', errors='replace')),
+                fingerprint)
+
+    def run(self,
+            rerun_all: bool = False) -> list[TestResult]:
+
+        passing_fingerprints: dict[str, str] = {} if rerun_all else self._read_passing_fingerprints()
+
+        with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+
+            # Executables are run once per argument set, and libraries are loaded by many executables, so every file is
+            # only hashed once per run
+            file_paths: list[Path] = \
+                list(dict.fromkeys([file_path for test_case in self._test_cases for file_path in [test_case.executable_path] + test_case.library_paths]))  # noqa: E501
+            hash_per_path: dict[Path, str] = dict(zip(file_paths, executor.map(hash_file, file_paths)))
+
+            results_and_fingerprints: list[tuple[TestResult, str]] = \
+                list(executor.map(lambda test_case: self._run_test_case(test_case, passing_fingerprints.get(str(test_case)), hash_per_path), self._test_cases))  # noqa: E501
+
+        # Only remember the tests which passed, so that anything which failed (or timed out) runs again next time
+        passing_fingerprints = self._read_passing_fingerprints()
+        for result, fingerprint in results_and_fingerprints:
+            if result.succeeded:
+                passing_fingerprints[str(result.test_case)] = fingerprint
+            else:
+                passing_fingerprints.pop(str(result.test_case), None)
+
+        if not self._state_path.parent.exists():
+            self._state_path.parent.mkdir(parents=True)
+        self._state_path.write_text(json.dumps(passing_fingerprints, indent=4, sort_keys=True))
+
+        results: list[TestResult] = [result for result, _ in results_and_fingerprints]
+        print(self._format_results(results))
+
+        return results
+
+    def _format_results(self,
+                        results: list[TestResult]) -> str:
+
+        title: str = 'Test Results'
+        max_test_length: int = max([len(str(result.test_case)) for result in results], default=0)
+
+        formatted_results: list[str] = \
+            [f'{str(result.test_case):>{max_test_length:d}s}: {result.status:s} ({result.duration:.3f} s)' for result in results]  # noqa: E501
+        formatted_results.append(f'\nPassed: {len([result for result in results if result.status == 'Passed']):d}, Unchanged: {len([result for result in results if result.status == 'Unchanged']):d}, Failed: {len([result for result in results if not result.succeeded]):d} of {len(results):d}')  # noqa: E501
+
+        for result in results:
+            if not result.succeeded:
+                formatted_results.append(f'\n{str(result.test_case):s} ({result.status:s}{f', return code {result.return_code:d}' if result.return_code is not None else '':s}):\n{result.output:s}')  # noqa: E501
+
+        return f'\n{title:s}\n{'':{'-':s}>{len(title):d}s}\n{'\n'.join(formatted_results):s}\n'  # noqa: E231
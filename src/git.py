@@ -1,3 +1,4 @@
+import subprocess
 from pathlib import Path
 from command import run_command
 from urllib.parse import urlunsplit
@@ -28,3 +29,18 @@ def retrieve_repository_from_github(parent_directory: Path,
 
     return (repository_directory,
             repo_already_exists)
+
+
+def get_current_commit(repository_directory: Path) -> str | None:
+
+    # This runs at the start of every recorded build, so it stays quiet rather than reporting itself like other commands
+    try:
+        results: subprocess.CompletedProcess[bytes] = \
+            subprocess.run(['git', 'rev-parse', 'HEAD'],
+                           capture_output=True,
+                           cwd=repository_directory)
+    except OSError:
+        return None
+
+    # Not every code base lives within a Git repository, in which case there is simply no commit to report
+    return results.stdout.decode('utf-8').strip() if results.returncode == 0 else None
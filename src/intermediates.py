@@ -0,0 +1,184 @@
+import os
+import shutil
+import hashlib
+import threading
+import platform
+from pathlib import Path
+
+
+DEFAULT_INTERMEDIATE_SIZE_CAP: int = 512*1024*1024
+
+# https://gcc.gnu.org/onlinedocs/gcc/Overall-Options.html
+RAM_BACKED_FLAGS: list[str] = ['pipe']
+
+# RAM-backed directories are grouped under the name of this project, where each one records the Build directory it
+# belongs to (so that it can be removed once that Build directory is gone)
+RAM_BACKED_DIRECTORY_NAME: str = Path(__file__).resolve().parent.parent.name
+BUILD_DIRECTORY_MARKER_NAME: str = 'build_directory.txt'
+
+
+def ram_backed_directory() -> Path | None:
+
+    # Linux always mounts a tmpfs at /dev/shm, whereas other platforms have no RAM-backed directory to rely on
+    shared_memory_directory: Path = Path('/dev/shm')
+    if platform.system() == 'Linux' and shared_memory_directory.is_dir() and os.access(shared_memory_directory, os.W_OK):
+        return shared_memory_directory
+
+    return None
+
+
+# The intermediate files of a build (object files, depfiles, split debug information, compiled module interfaces) are
+# kept in RAM when possible, and spilled onto disk once they outgrow the size cap. The size cap is soft, since files are
+# only counted once they have been written, so the compilations running when the cap is reached may overshoot it by the
+# size of their own outputs (every output after that is written straight onto disk instead)
+class IntermediateDirectory:
+
+    def __init__(self,
+                 build_directory: Path,
+                 ram_backed: bool = False,
+                 size_cap: int = DEFAULT_INTERMEDIATE_SIZE_CAP) -> None:
+
+        if size_cap < 0:
+            raise ValueError('The size cap of the intermediate directory cannot be negative')
+
+        self._size_cap: int = size_cap
+
+        # Anything which does not fit within the size cap is spilled onto disk, within the Build directory
+        self._spill_directory: Path = build_directory/'intermediate'
+
+        # Every Build directory gets its own RAM-backed directory, so that isolated builds (e.g., variants) never collide
+        shared_memory_directory: Path | None = ram_backed_directory() if ram_backed else None
+        self._is_ram_backed: bool = shared_memory_directory is not None
+        if ram_backed and not self._is_ram_backed:
+            print(f'\nNo RAM-backed directory is available on {platform.system():s}, so intermediate files stay in {str(build_directory):s}\n')  # noqa: E501
+
+        self._build_directory: Path = build_directory
+        self._path: Path = \
+            shared_memory_directory/RAM_BACKED_DIRECTORY_NAME/hashlib.sha256(str(build_directory.resolve()).encode('utf-8')).hexdigest()[:16] if shared_memory_directory else build_directory  # noqa: E501
+
+        # A RAM-backed directory outlives the process (which is what keeps incremental builds fast), but not the Build
+        # directory it belongs to, so any left behind by a Build directory that was since removed are removed too
+        if self._is_ram_backed:
+            self._remove_orphaned_directories()
+
+        # The size of every file kept in RAM is tracked, so that the cap is checked without walking the directory,
+        # where hardlinked files (e.g., cached module interface objects) only take up their space once
+        self._inode_and_size_per_file: dict[Path, tuple[int, int]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        if self._is_ram_backed and self._path.exists():
+            for root, _, files in self._path.walk():
+                for file in files:
+                    if not (root/file).is_symlink() and (root/file) != self._path/BUILD_DIRECTORY_MARKER_NAME:
+                        status: os.stat_result = (root/file).stat()
+                        self._inode_and_size_per_file[root/file] = (status.st_ino, status.st_size)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def is_ram_backed(self) -> bool:
+        return self._is_ram_backed
+
+    @property
+    def size_cap(self) -> int:
+        return self._size_cap
+
+    @property
+    def spill_directory(self) -> Path:
+        return self._spill_directory
+
+    @property
+    def usage(self) -> int:
+        return sum(dict(self._inode_and_size_per_file.values()).values())
+
+    def _remove_orphaned_directories(self) -> None:
+
+        for directory in self._path.parent.iterdir() if self._path.parent.exists() else []:
+            marker_path: Path = directory/BUILD_DIRECTORY_MARKER_NAME
+            if marker_path.exists() and not Path(marker_path.read_text()).exists():
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def create(self) -> None:
+        if not self._path.exists():
+            self._path.mkdir(parents=True)
+        if self._is_ram_backed:
+            (self._path/BUILD_DIRECTORY_MARKER_NAME).write_text(str(self._build_directory.resolve()))
+
+    def _spilled_file_path(self,
+                           file_path: Path) -> Path:
+
+        # Spilled files keep their place within the directory, since e.g. an interface object file within gcm.cache
+        # has the same name as the object file it was cached from
+        spilled_file_path: Path = self._spill_directory/file_path.relative_to(self._path)
+        if not spilled_file_path.parent.exists():
+            spilled_file_path.parent.mkdir(parents=True)
+
+        return spilled_file_path
+
+    def reserve(self,
+                file_paths: list[Path]) -> None:
+
+        if not self._is_ram_backed:
+            return
+
+        # Once the cap has been reached, files about to be written are pointed at the disk up front (the compiler
+        # writes through the symlink), rather than being written into RAM first and spilled afterwards
+        with self._lock:
+            if self.usage >= self._size_cap:
+                for file_path in file_paths:
+                    if not (file_path.exists() or file_path.is_symlink()):
+                        file_path.symlink_to(self._spilled_file_path(file_path).resolve())
+
+    def store(self,
+              file_paths: list[Path]) -> None:
+
+        if not self._is_ram_backed:
+            return
+
+        # Several source files may be compiled at once, so the usage is only ever checked and updated by one at a time
+        with self._lock:
+            for file_path in file_paths:
+
+                # A reserved file which was never written leaves a dangling symlink, which is removed
+                if file_path.is_symlink() and not file_path.exists():
+                    Path.unlink(file_path)
+                if not file_path.exists() or file_path.is_symlink():
+                    continue
+
+                status: os.stat_result = file_path.stat()
+                self._inode_and_size_per_file.pop(file_path, None)
+
+                # Once the cap is hit, the file moves onto disk and leaves a symlink behind, so that its path never changes
+                if self.usage + status.st_size > self._size_cap:
+                    spilled_file_path: Path = self._spilled_file_path(file_path)
+                    shutil.move(file_path, spilled_file_path)
+                    file_path.symlink_to(spilled_file_path.resolve())
+                else:
+                    self._inode_and_size_per_file[file_path] = (status.st_ino, status.st_size)
+
+    def remove(self,
+               file_path: Path) -> None:
+
+        with self._lock:
+
+            # A spilled file is removed along with the symlink pointing at it
+            if file_path.is_symlink():
+                if file_path.resolve().exists():
+                    Path.unlink(file_path.resolve())
+            self._inode_and_size_per_file.pop(file_path, None)
+
+            if file_path.exists() or file_path.is_symlink():
+                Path.unlink(file_path)
+
+    def clean(self) -> None:
+
+        if not self._is_ram_backed:
+            return
+
+        # Free the RAM along with whatever was spilled onto disk
+        with self._lock:
+            for directory in [self._path, self._spill_directory]:
+                if directory.exists():
+                    shutil.rmtree(directory)
+            self._inode_and_size_per_file = {}
@@ -0,0 +1,65 @@
+import hashlib
+import subprocess
+from pathlib import Path
+
+from staging import hash_file
+
+
+def list_archive_members(archive_path: Path) -> list[str]:
+
+    results: subprocess.CompletedProcess[bytes] = \
+        subprocess.run(['ar', 't', str(archive_path)],
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE)
+
+    if results.returncode != 0:
+        raise Exception(f'Could not list the members of the following static library: {str(archive_path):s}\n\n{results.stderr.decode('utf-8'):s}')  # noqa: E501
+
+    return [member for member in results.stdout.decode('utf-8').splitlines() if member]
+
+
+def exported_symbol_table_hash(library_path: Path) -> str:
+
+    # Executables only see the dynamic symbol table of a shared library, so nothing else about it can require a relink
+    results: subprocess.CompletedProcess[bytes] = \
+        subprocess.run(['nm', '--dynamic', '--defined-only', '--format=posix', str(library_path)],
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE)
+
+    # If the dynamic symbol table cannot be read (e.g., for a .dll), then fall back onto the whole library
+    if results.returncode != 0 or not results.stdout:
+        return hash_file(library_path)
+
+    # Only the name and type of each symbol are part of the interface, not their addresses or sizes
+    symbols: list[str] = sorted([' '.join(line.split()[:2]) for line in results.stdout.decode('utf-8').splitlines() if line])  # noqa: E501
+
+    return hashlib.sha256('\n'.join(symbols).encode('utf-8')).hexdigest()
+
+
+def hash_link_inputs(link_command: str,
+                     object_file_paths: list[Path],
+                     libraries: list[tuple[Path, bool]]) -> str:
+
+    link_inputs_hash = hashlib.sha256()
+    link_inputs_hash.update(link_command.encode('utf-8'))
+
+    # Object files are identified by their modification time and size, which is all that incremental builds rely on
+    for object_file_path in object_file_paths:
+        object_file_status = object_file_path.stat()
+        link_inputs_hash.update(f'{str(object_file_path):s}\0{object_file_status.st_mtime_ns:d}\0{object_file_status.st_size:d}\0'.encode('utf-8'))  # noqa: E501
+
+    # Static libraries are copied into the output, whereas shared libraries only contribute their exported symbols
+    for library_path, is_dynamic in libraries:
+        if is_dynamic:
+            link_inputs_hash.update(f'{str(library_path):s}\0{exported_symbol_table_hash(library_path):s}\0'.encode('utf-8'))  # noqa: E501
+        else:
+            library_status = library_path.stat()
+            link_inputs_hash.update(f'{str(library_path):s}\0{library_status.st_mtime_ns:d}\0{library_status.st_size:d}\0'.encode('utf-8'))  # noqa: E501
+
+    return link_inputs_hash.hexdigest()
+
+
+def link_is_up_to_date(output_path: Path,
+                       stamp_path: Path,
+                       link_inputs_hash: str) -> bool:
+    return output_path.exists() and stamp_path.exists() and stamp_path.read_text() == link_inputs_hash
@@ -0,0 +1,226 @@
+import re
+import hashlib
+from pathlib import Path
+
+from depfile import read_depfile
+from staging import stage_file
+
+
+# https://gcc.gnu.org/onlinedocs/gcc/C_002b_002b-Modules.html
+MODULE_FLAGS: list[str] = ['fmodules-ts']
+
+
+def _strip_comments(source_code: str) -> str:
+    return re.sub(r'//[^\n]*|/\*.*?\*/', ' ', source_code, flags=re.DOTALL)
+
+
+def scan_module_declarations(source_file_path: Path) -> tuple[str | None, bool, list[str]]:
+
+    source_code: str = _strip_comments(source_file_path.read_text(errors='replace'))
+
+    declared_module: str | None = None
+    is_interface: bool = False
+    imported_modules: list[str] = []
+
+    # The global module fragment ('module;') does not declare anything, so only named declarations are matched
+    matched_declaration: re.Match[str] | None = \
+        re.search(r'^\s*(export\s+)?module\s+([\w.]+(?::[\w.]+)?)\s*;', source_code, flags=re.MULTILINE)
+    if matched_declaration:
+        declared_module = matched_declaration.groups()[1]
+        is_exported: bool = matched_declaration.groups()[0] is not None
+
+        # Partitions produce a compiled module interface whether they are exported or not
+        is_interface = is_exported or ':' in declared_module
+
+        # An implementation unit implicitly imports the interface of its own module
+        if not is_interface:
+            imported_modules.append(declared_module)
+
+    # Header units ('import <header>;' or 'import "header";') are not named modules, so they are left to the compiler
+    for matched_import in re.finditer(r'^\s*(?:export\s+)?import\s+([\w.]*)(:[\w.]+)?\s*;', source_code, flags=re.MULTILINE):  # noqa: E501
+
+        imported_module: str = matched_import.groups()[0]
+        partition: str | None = matched_import.groups()[1]
+
+        # A partition is imported without the name of its primary module, e.g. 'import :part;' within module 'math'
+        if partition:
+            primary_module: str = declared_module.split(':')[0] if declared_module else ''
+            imported_module = f'{imported_module or primary_module:s}{partition:s}'
+
+        if imported_module and imported_module not in imported_modules:
+            imported_modules.append(imported_module)
+
+    return (declared_module,
+            is_interface,
+            imported_modules)
+
+
+class ModuleGraph:
+
+    def __init__(self,
+                 source_file_paths: list[Path]) -> None:
+
+        self._source_file_paths: list[Path] = source_file_paths
+
+        self._interface_per_module: dict[str, Path] = {}
+        self._module_per_interface: dict[Path, str] = {}
+        self._imported_modules_per_source: dict[Path, list[str]] = {}
+
+        for source_file_path in self._source_file_paths:
+
+            declared_module, is_interface, imported_modules = scan_module_declarations(source_file_path)
+
+            if is_interface:
+                if declared_module in self._interface_per_module:
+                    raise ValueError(f'The \'{declared_module:s}\' module interface is declared in both {str(self._interface_per_module[declared_module]):s} and {str(source_file_path):s}')  # noqa: E501
+                self._interface_per_module[declared_module] = source_file_path
+                self._module_per_interface[source_file_path] = declared_module
+
+            self._imported_modules_per_source[source_file_path] = imported_modules
+
+        for source_file_path, imported_modules in self._imported_modules_per_source.items():
+            for imported_module in imported_modules:
+                if imported_module not in self._interface_per_module:
+                    raise ValueError(f'The \'{imported_module:s}\' module imported by {str(source_file_path):s} is not exported by any source file')  # noqa: E501
+
+    @property
+    def module_names(self) -> list[str]:
+        return list(self._interface_per_module.keys())
+
+    def module_of(self,
+                  source_file_path: Path) -> str | None:
+        return self._module_per_interface.get(source_file_path)
+
+    def imported_modules_of(self,
+                            source_file_path: Path) -> list[str]:
+        return self._imported_modules_per_source[source_file_path]
+
+    def ordered_source_file_paths(self) -> list[Path]:
+
+        # Order the source files such that every module interface is compiled before anything importing it,
+        # while otherwise keeping the original order of the source files
+        ordered_source_file_paths: list[Path] = []
+        visiting: set[Path] = set()
+        visited: set[Path] = set()
+
+        def visit(source_file_path: Path) -> None:
+
+            if source_file_path in visited:
+                return
+            if source_file_path in visiting:
+                raise ValueError(f'The module imports of {str(source_file_path):s} form a cycle')
+
+            visiting.add(source_file_path)
+            for imported_module in self._imported_modules_per_source[source_file_path]:
+                visit(self._interface_per_module[imported_module])
+            visiting.remove(source_file_path)
+
+            visited.add(source_file_path)
+            ordered_source_file_paths.append(source_file_path)
+
+        for source_file_path in self._source_file_paths:
+            visit(source_file_path)
+
+        return ordered_source_file_paths
+
+
+class ModuleInterfaceCache:
+
+    def __init__(self,
+                 cache_directory: Path,
+                 working_directory: Path) -> None:
+
+        self._cache_directory: Path = cache_directory
+        self._working_directory: Path = working_directory
+
+    @property
+    def cache_directory(self) -> Path:
+        return self._cache_directory
+
+    @property
+    def mapper_path(self) -> Path:
+        return self._cache_directory/'module_mapper.txt'
+
+    def _cached_file_path(self,
+                          module_name: str,
+                          suffix: str) -> Path:
+
+        # Partitions are named '<module>:<partition>', and colons do not belong in file names
+        return self._cache_directory/f'{module_name.replace(':', '-'):s}{suffix:s}'
+
+    def module_interface_path(self,
+                              module_name: str) -> Path:
+        return self._cached_file_path(module_name, '.gcm')
+
+    def cached_file_paths(self,
+                          module_name: str) -> list[Path]:
+        return [self._cached_file_path(module_name, suffix) for suffix in ['.gcm', '.o', '.d']]
+
+    def write_module_mapper(self,
+                            module_names: list[str]) -> None:
+
+        if not self._cache_directory.exists():
+            self._cache_directory.mkdir(parents=True)
+
+        # Each line of the mapper file maps a module name onto its compiled module interface
+        mapper: str = ''.join([f'{module_name:s} {str(self.module_interface_path(module_name).absolute()):s}\n' for module_name in module_names])  # noqa: E501
+
+        if not self.mapper_path.exists() or self.mapper_path.read_text() != mapper:
+            self.mapper_path.write_text(mapper)
+
+    def stamp(self,
+              module_name: str,
+              compilation_flags: str,
+              source_file_path: Path,
+              imported_stamps: list[str]) -> str:
+
+        # The stamp covers the flags, the contents of the interface and every header it included last time,
+        # and the stamps of every module it imports (so that a change ripples through to its importers)
+        depfile_path: Path = self._cached_file_path(module_name, '.d')
+        prerequisite_paths: list[Path] = \
+            list(dict.fromkeys([source_file_path] + (read_depfile(depfile_path, self._working_directory) if depfile_path.exists() else [])))  # noqa: E501
+
+        stamp_hash = hashlib.sha256()
+        stamp_hash.update(compilation_flags.encode('utf-8'))
+        for prerequisite_path in prerequisite_paths:
+            stamp_hash.update(str(prerequisite_path).encode('utf-8'))
+            stamp_hash.update(prerequisite_path.read_bytes() if prerequisite_path.exists() else b'')
+        for imported_stamp in imported_stamps:
+            stamp_hash.update(imported_stamp.encode('utf-8'))
+
+        return stamp_hash.hexdigest()
+
+    def is_up_to_date(self,
+                      module_name: str,
+                      stamp: str) -> bool:
+
+        stamp_path: Path = self._cached_file_path(module_name, '.stamp')
+
+        return stamp_path.exists() and stamp_path.read_text() == stamp and \
+            self.module_interface_path(module_name).exists() and self._cached_file_path(module_name, '.o').exists()
+
+    def store(self,
+              module_name: str,
+              object_file_path: Path) -> None:
+
+        # Keep the object file of the interface (and its depfile) alongside its compiled module interface
+        for suffix in ['.o', '.d']:
+            if object_file_path.with_suffix(suffix).exists():
+                stage_file(object_file_path.with_suffix(suffix),
+                           self._cached_file_path(module_name, suffix),
+                           allow_symlink=False)
+
+    def write_stamp(self,
+                    module_name: str,
+                    stamp: str) -> None:
+        self._cached_file_path(module_name, '.stamp').write_text(stamp)
+
+    def restore(self,
+                module_name: str,
+                object_file_path: Path) -> None:
+
+        for suffix in ['.o', '.d']:
+            if self._cached_file_path(module_name, suffix).exists():
+                stage_file(self._cached_file_path(module_name, suffix),
+                           object_file_path.with_suffix(suffix),
+                           allow_symlink=False)
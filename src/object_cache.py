@@ -0,0 +1,156 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable
+
+from depfile import read_depfile
+from staging import hash_file, stage_file
+
+
+class ObjectCache:
+
+    def __init__(self,
+                 cache_directory: Path) -> None:
+
+        self._cache_directory: Path = cache_directory
+        if not self._cache_directory.exists():
+            self._cache_directory.mkdir(parents=True)
+
+        # Each key maps onto an event which is set once its object file has been compiled (or has failed to compile)
+        self._lock: threading.Lock = threading.Lock()
+        self._compiled_event_per_key: dict[str, threading.Event] = {}
+
+        # Headers are shared by most translation units, so each one is only hashed again once it changes
+        self._hash_per_prerequisite: dict[Path, tuple[int, int, str]] = {}
+
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def cache_directory(self) -> Path:
+        return self._cache_directory
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @staticmethod
+    def key(utility: str,
+            compilation_flags: str,
+            source_file_path: Path) -> str:
+
+        # Two compilations may be identical if they run the same compiler with the same flags over the same source file,
+        # which is then confirmed by checking every header it includes against the manifest of the cached object file
+        key_hash = hashlib.sha256()
+        key_hash.update(f'{utility:s}\0{compilation_flags:s}\0{str(source_file_path.resolve()):s}\0'.encode('utf-8'))
+        key_hash.update(source_file_path.read_bytes())
+
+        return key_hash.hexdigest()
+
+    def _hash_prerequisite(self,
+                           prerequisite_path: Path) -> str:
+
+        status: os.stat_result = prerequisite_path.stat()
+        with self._lock:
+            cached_hash: tuple[int, int, str] | None = self._hash_per_prerequisite.get(prerequisite_path)
+        if cached_hash and cached_hash[:2] == (status.st_mtime_ns, status.st_size):
+            return cached_hash[2]
+
+        prerequisite_hash: str = hash_file(prerequisite_path)
+        with self._lock:
+            self._hash_per_prerequisite[prerequisite_path] = (status.st_mtime_ns, status.st_size, prerequisite_hash)
+
+        return prerequisite_hash
+
+    def _retrieve(self,
+                  key: str,
+                  object_file_path: Path) -> bool:
+
+        # A cached object file is only reused if every prerequisite it was compiled from still has the same contents
+        manifest_path: Path = self._cache_directory/f'{key:s}.json'
+        if not manifest_path.exists():
+            return False
+
+        hash_per_prerequisite: dict[str, str] = json.loads(manifest_path.read_text())
+        for prerequisite, prerequisite_hash in hash_per_prerequisite.items():
+            if not Path(prerequisite).exists() or self._hash_prerequisite(Path(prerequisite)) != prerequisite_hash:
+                return False
+
+        cached_object_file_path: Path = self._cache_directory/f'{key:s}.o'
+        for suffix in ['.o', '.d', '.dwo']:
+            if cached_object_file_path.with_suffix(suffix).exists():
+                stage_file(cached_object_file_path.with_suffix(suffix),
+                           object_file_path.with_suffix(suffix),
+                           allow_symlink=False)
+
+        return True
+
+    def _store(self,
+               key: str,
+               object_file_path: Path,
+               working_directory: Path) -> None:
+
+        # Without a depfile there is no telling which headers the object file depends on, so it is not cached
+        depfile_path: Path = object_file_path.with_suffix('.d')
+        if not depfile_path.exists():
+            return
+
+        hash_per_prerequisite: dict[str, str] = \
+            {str(prerequisite_path.resolve()): self._hash_prerequisite(prerequisite_path.resolve()) for prerequisite_path in read_depfile(depfile_path, working_directory)}  # noqa: E501
+
+        cached_object_file_path: Path = self._cache_directory/f'{key:s}.o'
+        for suffix in ['.o', '.d', '.dwo']:
+            if object_file_path.with_suffix(suffix).exists():
+                stage_file(object_file_path.with_suffix(suffix),
+                           cached_object_file_path.with_suffix(suffix),
+                           allow_symlink=False)
+
+        # The manifest is written last (and whole), since it is what marks the cached object file as usable
+        manifest_path: Path = self._cache_directory/f'{key:s}.json'
+        temporary_manifest_path: Path = manifest_path.with_name(f'.{manifest_path.name:s}.{threading.get_ident():d}')
+        temporary_manifest_path.write_text(json.dumps(hash_per_prerequisite, indent=4, sort_keys=True))
+        os.replace(temporary_manifest_path, manifest_path)
+
+    def retrieve_or_compile(self,
+                            key: str,
+                            object_file_path: Path,
+                            compile_object_file: Callable[[], None],
+                            working_directory: Path) -> bool:
+
+        with self._lock:
+            compiled_event: threading.Event | None = self._compiled_event_per_key.get(key)
+            is_first_request: bool = compiled_event is None
+            if is_first_request:
+                compiled_event = threading.Event()
+                self._compiled_event_per_key[key] = compiled_event
+
+        # The first build to ask for an object file compiles it, and every other build waits on it and reuses it
+        if not is_first_request:
+            compiled_event.wait()
+
+        try:
+            retrieved: bool = self._retrieve(key, object_file_path)
+
+            # Compile the object file if it was never cached, if a header changed since, or if the first build failed
+            # to compile it (in which case compiling it again reports the failure here too)
+            if not retrieved:
+                compile_object_file()
+                self._store(key, object_file_path, working_directory)
+
+        finally:
+            if is_first_request:
+                compiled_event.set()
+
+        with self._lock:
+            if retrieved:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        return retrieved
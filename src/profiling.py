@@ -0,0 +1,161 @@
+import re
+from pathlib import Path
+
+
+# https://gcc.gnu.org/onlinedocs/gcc/Developer-Options.html
+PROFILING_FLAGS: list[str] = ['ftime-report', 'H']
+
+PARSING_PHASES: list[str] = ['phase parsing',
+                             'phase lang. deferred',
+                             'phase late parsing cleanups']
+
+CODE_GENERATION_PHASES: list[str] = ['phase opt and generate',
+                                     'phase last asm']
+
+
+def parse_time_report(compiler_output: str) -> dict[str, float]:
+
+    # Each line of the '-ftime-report' table looks like:
+    #  phase parsing                      :   0.10 ( 38%)   0.02 ( 40%)   0.13 ( 39%)  8.1M ( 60%)
+    # where the three timings are the user, system, and wall times respectively
+    wall_time_per_phase: dict[str, float] = {}
+
+    for line in compiler_output.splitlines():
+        matched_line: re.Match[str] | None = \
+            re.match(r'\s*(phase .+?)\s*:\s*([\d.]+)\s*\(\s*\d+%\)\s*([\d.]+)\s*\(\s*\d+%\)\s*([\d.]+)\s*\(\s*\d+%\)', line)  # noqa: E501
+        if matched_line:
+            wall_time_per_phase[matched_line.groups()[0]] = \
+                wall_time_per_phase.get(matched_line.groups()[0], 0.0) + float(matched_line.groups()[3])
+
+    return wall_time_per_phase
+
+
+def parse_include_trace(compiler_output: str,
+                        working_directory: Path) -> list[Path]:
+
+    # Each line of the '-H' trace is the included header, prefixed by one dot per level of include depth
+    included_headers: list[Path] = []
+
+    for line in compiler_output.splitlines():
+        matched_line: re.Match[str] | None = re.fullmatch(r'\.+ (.+)', line.rstrip())
+        if matched_line:
+            header_path: Path = Path(matched_line.groups()[0])
+            header_path = (header_path if header_path.is_absolute() else working_directory/header_path).resolve()
+            if header_path not in included_headers:
+                included_headers.append(header_path)
+
+    return included_headers
+
+
+class CompilationProfile:
+
+    def __init__(self,
+                 source_file_path: Path,
+                 compiler_output: str,
+                 working_directory: Path) -> None:
+
+        self._source_file_path: Path = source_file_path
+        self._wall_time_per_phase: dict[str, float] = parse_time_report(compiler_output)
+        self._included_headers: list[Path] = parse_include_trace(compiler_output, working_directory)
+
+    @property
+    def source_file_path(self) -> Path:
+        return self._source_file_path
+
+    @property
+    def wall_time_per_phase(self) -> dict[str, float]:
+        return self._wall_time_per_phase
+
+    @property
+    def included_headers(self) -> list[Path]:
+        return self._included_headers
+
+    @property
+    def parsing_time(self) -> float:
+        return sum([self._wall_time_per_phase.get(phase, 0.0) for phase in PARSING_PHASES])
+
+    @property
+    def code_generation_time(self) -> float:
+        return sum([self._wall_time_per_phase.get(phase, 0.0) for phase in CODE_GENERATION_PHASES])
+
+    def parsing_time_per_header(self) -> dict[Path, float]:
+
+        # GCC does not time individual headers, so the parsing time of this translation unit is shared out
+        # between the source file and every header it pulls in, in proportion to the size of each file
+        file_sizes: dict[Path, int] = \
+            {file_path: file_path.stat().st_size if file_path.exists() else 0 for file_path in [self._source_file_path] + self._included_headers}  # noqa: E501
+        total_size: int = sum(file_sizes.values())
+
+        return {header: self.parsing_time*file_sizes[header]/total_size if total_size else 0.0 for header in self._included_headers}  # noqa: E501
+
+
+class ProfileReport:
+
+    def __init__(self) -> None:
+        self._profiles: list[CompilationProfile] = []
+
+    def __str__(self) -> str:
+
+        def format_table(title: str,
+                         column_titles: list[str],
+                         rows: list[list[str]]) -> str:
+
+            column_widths: list[int] = \
+                [max([len(column_title)] + [len(row[column]) for row in rows]) for column, column_title in enumerate(column_titles)]  # noqa: E501
+
+            formatted_rows: list[str] = \
+                ['  '.join([f'{cell:>{column_widths[column]:d}s}' for column, cell in enumerate(row)]) for row in [column_titles] + rows]  # noqa: E501
+
+            return f'{title:s}:\n{'':{'-':s}>{len(title) + 1:d}s}\n{'\n'.join(formatted_rows):s}'  # noqa: E231
+
+        description: str = \
+            '\n\n'.join([format_table('Time per Compiler Phase',
+                                      ['Phase', 'Wall Time (s)'],
+                                      [[phase, f'{wall_time:.3f}'] for phase, wall_time in self.time_per_phase().items()]),  # noqa: E501
+                         format_table('Most Expensive Headers',
+                                      ['Header', 'Including TUs', 'Estimated Parsing Time (s)'],
+                                      [[str(header), f'{including_count:d}', f'{cost:.3f}'] for header, including_count, cost in self.most_expensive_headers()]),  # noqa: E501
+                         format_table('Translation Units by Parsing Time',
+                                      ['Translation Unit', 'Parsing Time (s)', 'Code Generation Time (s)'],
+                                      [[str(profile.source_file_path), f'{profile.parsing_time:.3f}', f'{profile.code_generation_time:.3f}'] for profile in self.translation_units_by_parsing_time()])])  # noqa: E501
+
+        return f'\n{description:s}\n'
+
+    @property
+    def profiles(self) -> list[CompilationProfile]:
+        return self._profiles
+
+    def add_profile(self,
+                    new_profile: CompilationProfile) -> None:
+        self._profiles.append(new_profile)
+
+    def time_per_phase(self) -> dict[str, float]:
+
+        wall_time_per_phase: dict[str, float] = {}
+        for profile in self._profiles:
+            for phase, wall_time in profile.wall_time_per_phase.items():
+                wall_time_per_phase[phase] = wall_time_per_phase.get(phase, 0.0) + wall_time
+
+        return dict(sorted(wall_time_per_phase.items(), key=lambda phase: phase[1], reverse=True))
+
+    def most_expensive_headers(self,
+                               count: int = 20) -> list[tuple[Path, int, float]]:
+
+        # Accumulate the estimated cost of each header over every translation unit including it,
+        # so that a header pulled in by many translation units is weighted accordingly
+        including_count_per_header: dict[Path, int] = {}
+        cost_per_header: dict[Path, float] = {}
+
+        for profile in self._profiles:
+            for header, cost in profile.parsing_time_per_header().items():
+                including_count_per_header[header] = including_count_per_header.get(header, 0) + 1
+                cost_per_header[header] = cost_per_header.get(header, 0.0) + cost
+
+        return sorted([(header, including_count_per_header[header], cost) for header, cost in cost_per_header.items()],
+                      key=lambda header: (header[2], header[1]),
+                      reverse=True)[:count]
+
+    def translation_units_by_parsing_time(self) -> list[CompilationProfile]:
+        return sorted(self._profiles,
+                      key=lambda profile: (profile.parsing_time, profile.code_generation_time),
+                      reverse=True)
@@ -6,7 +6,10 @@ from pathlib import Path
 
 from command import run_command
 from codebase import CodeBase, Dependency
+from build_plan import BuildPlan
 from git import retrieve_repository_from_github
+from staging import stage_tree
+from acquisition import AcquisitionPipeline
 from compilation_constants import C_SOURCE_CODE_EXTENSIONS, C_HEADER_EXTENSIONS
 
 
@@ -85,9 +88,7 @@ def insert_OS_guards(source_file_names: list[str],
             _insert(source_file_path.with_suffix('.h'), OS_guard)
 
 
-def get_fmt_dependency(example_repos_dir: Path) -> Dependency:
-
-    fmt_dependency: Dependency
+def prepare_fmt_repository(example_repos_dir: Path) -> tuple[Path, bool]:
 
     (repository_directory,
      repo_already_exists) = \
@@ -97,9 +98,6 @@ def get_fmt_dependency(example_repos_dir: Path) -> Dependency:
 
     source_directory: Path = repository_directory/'src'
     include_directory: Path = repository_directory/'include'
-    build_directory: Path = repository_directory/'build'
-    library_directory: Path = build_directory/'lib'
-    is_dynamic: bool = False
 
     if not repo_already_exists:
 
@@ -117,6 +115,22 @@ def get_fmt_dependency(example_repos_dir: Path) -> Dependency:
         remove_lines(source_directory/'fmt.cc',
                      [0, 89, 95, 96, 97, 132, 133, 134, 135])
 
+    return (repository_directory,
+            repo_already_exists)
+
+
+def build_fmt_dependency(repository_directory: Path,
+                         repo_already_exists: bool) -> Dependency:
+
+    fmt_dependency: Dependency
+
+    include_directory: Path = repository_directory/'include'
+    build_directory: Path = repository_directory/'build'
+    library_directory: Path = build_directory/'lib'
+    is_dynamic: bool = False
+
+    if not repo_already_exists:
+
         fmt_codebase = \
             CodeBase('fmt',
                      repository_directory,
@@ -137,10 +151,13 @@ def get_fmt_dependency(example_repos_dir: Path) -> Dependency:
     return fmt_dependency
 
 
-def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
+def get_fmt_dependency(example_repos_dir: Path) -> Dependency:
+    return build_fmt_dependency(*prepare_fmt_repository(example_repos_dir))
+
+
+def prepare_libusb_repository(example_repos_dir: Path) -> tuple[Path, bool]:
 
     name: str = 'libusb'
-    libusb_dependency: Dependency
 
     (repository_directory,
      repo_already_exists) = \
@@ -150,9 +167,6 @@ def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
 
     source_directory: Path = repository_directory/'src'
     include_directory: Path = repository_directory/'include'
-    build_directory: Path = repository_directory/'build'
-    library_directory: Path = build_directory/'lib'
-    is_dynamic: bool = False
 
     if not repo_already_exists:
 
@@ -184,8 +198,10 @@ def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
         shutil.move(repository_directory/'config.h',
                     repository_directory/name/'config.h')
 
-        shutil.copytree(repository_directory/name,
-                        source_directory)
+        # The staged tree must not be made of symlinks, since the original tree is removed right afterwards
+        stage_tree(repository_directory/name,
+                   source_directory,
+                   allow_symlink=False)
 
         shutil.rmtree(repository_directory/name)
 
@@ -270,6 +286,20 @@ def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
                          source_directory/'os',
                          '__sun')
 
+    return (repository_directory,
+            repo_already_exists)
+
+
+def build_libusb_dependency(repository_directory: Path,
+                            repo_already_exists: bool) -> Dependency:
+
+    name: str = 'libusb'
+    libusb_dependency: Dependency
+
+    is_dynamic: bool = False
+
+    if not repo_already_exists:
+
         libusb_codebase: CodeBase = \
             CodeBase(name,
                      repository_directory,
@@ -285,50 +315,30 @@ def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
     
     else:
 
-        libusb_dependency = \
-            Dependency(name,
-                       include_directory,
-                       False,
-                       is_dynamic,
-                       library_directory)
+        libusb_dependency = describe_libusb_dependency(repository_directory)
 
     return libusb_dependency
 
-if (__name__ != '__main__'):
 
-    Test_codebase: CodeBase | None = None
+def describe_libusb_dependency(repository_directory: Path) -> Dependency:
 
-    try:
+    # Everything about the libusb dependency is known as soon as its sources are prepared, even before it is built
+    return Dependency('libusb',
+                      repository_directory/'include',
+                      False,
+                      False,
+                      repository_directory/'build'/'lib')
 
-        fmt_dependency: Dependency = \
-            get_fmt_dependency(Path.cwd()/'real_world_repos')
-    
-        Test_codebase = \
-            CodeBase('test',
-                     Path.cwd()/'real_world_repos'/'Test',
-                     warnings=['Avoid a lot of questionable coding practices',
-                               'Avoid even more questionable coding practices'])
-    
-        Test_codebase.add_dependency(fmt_dependency)
-        Test_codebase.generate_as_executable()
 
-    except Exception:
-        print(traceback.format_exc())
+def get_libusb_dependency(example_repos_dir: Path) -> Dependency:
+    return build_libusb_dependency(*prepare_libusb_repository(example_repos_dir))
 
-    else:
-        Test_codebase.test_executable()
 
-    finally:
-        if Test_codebase:
-            if Test_codebase.build_directory.exists():
-                shutil.rmtree(Test_codebase.build_directory)
+def prepare_SDL_repository(example_repos_dir: Path) -> tuple[Path, bool]:
 
-if (__name__ == '__main__'):
-
-    #"""
     (repository_directory,
      repo_already_exists) = \
-        retrieve_repository_from_github(Path.cwd()/'real_world_repos',
+        retrieve_repository_from_github(example_repos_dir,
                                         'SDL',
                                         'libsdl-org',
                                         'release-2.30.x')
@@ -386,16 +396,109 @@ if (__name__ == '__main__'):
         insert_lines(rwopsromfs_file_path.with_suffix('.h'),
                      [(21, '#include <stdio.h>')])
 
-    SDL_codebase = \
-            CodeBase('SDL',
-                     repository_directory,
-                     language_standard='C 2018',
+    return (repository_directory,
+            repo_already_exists)
+
+
+def compile_SDL_codebase(repository_directory: Path,
+                         libusb_dependency: Dependency) -> tuple[CodeBase, BuildPlan, list[Path]]:
+
+    SDL_codebase: CodeBase = \
+        CodeBase('SDL',
+                 repository_directory,
+                 language_standard='C 2018',
+                 warnings=['Avoid a lot of questionable coding practices',
+                           'Avoid even more questionable coding practices',
+                           'Follow Effective C++ Style Guidelines',
+                           'Avoid potentially value-changing implicit conversions',
+                           'Avoid potentially sign-changing implicit conversions for integers'],
+                 miscellaneous='')
+
+    SDL_codebase.add_dependency(libusb_dependency)
+
+    # SDL only needs the headers of libusb to be compiled, so the library itself is only needed once SDL is linked
+    # (the build is recorded from here until then)
+    SDL_codebase.start_build_record()
+    try:
+        build_plan: BuildPlan = SDL_codebase.plan(True)
+        object_paths: list[Path] = SDL_codebase.compile(build_plan)
+    except Exception:
+        SDL_codebase.finish_build_record(False)
+        raise
+
+    return (SDL_codebase,
+            build_plan,
+            object_paths)
+
+
+def link_SDL_dependency(SDL_codebase: CodeBase,
+                        build_plan: BuildPlan,
+                        object_paths: list[Path]) -> Dependency:
+
+    SDL_dependency: Dependency
+    succeeded: bool = False
+
+    try:
+        SDL_dependency = SDL_codebase.link(build_plan, True)
+        SDL_codebase.remove_object_files(object_paths, False)
+        succeeded = True
+
+    finally:
+        SDL_codebase.finish_build_record(succeeded)
+
+    return SDL_dependency
+
+
+def build_SDL_dependency(repository_directory: Path,
+                         libusb_dependency: Dependency) -> Dependency:
+    return link_SDL_dependency(*compile_SDL_codebase(repository_directory, libusb_dependency))
+
+
+if (__name__ != '__main__'):
+
+    Test_codebase: CodeBase | None = None
+
+    try:
+
+        fmt_dependency: Dependency = \
+            get_fmt_dependency(Path.cwd()/'real_world_repos')
+    
+        Test_codebase = \
+            CodeBase('test',
+                     Path.cwd()/'real_world_repos'/'Test',
                      warnings=['Avoid a lot of questionable coding practices',
-                               'Avoid even more questionable coding practices',
-                               'Follow Effective C++ Style Guidelines',
-                               'Avoid potentially value-changing implicit conversions',
-                               'Avoid potentially sign-changing implicit conversions for integers'],
-                     miscellaneous='')
+                               'Avoid even more questionable coding practices'])
+    
+        Test_codebase.add_dependency(fmt_dependency)
+        Test_codebase.generate_as_executable()
+
+    except Exception:
+        print(traceback.format_exc())
+
+    else:
+        Test_codebase.test_executable()
+
+    finally:
+        if Test_codebase:
+            if Test_codebase.build_directory.exists():
+                shutil.rmtree(Test_codebase.build_directory)
+
+if (__name__ == '__main__'):
+
+    example_repos_dir: Path = Path.cwd()/'real_world_repos'
+
+    # Clone and prepare every repository at once, and build each one as soon as its own sources (and dependencies) are ready
+    pipeline: AcquisitionPipeline = AcquisitionPipeline()
+
+    pipeline.add('libusb',
+                 lambda: prepare_libusb_repository(example_repos_dir),
+                 lambda prepared, _: build_libusb_dependency(*prepared))
+
+    # SDL is compiled as soon as both it and libusb are prepared, and is only linked once libusb has been built
+    pipeline.add('SDL',
+                 lambda: prepare_SDL_repository(example_repos_dir),
+                 lambda compiled, _: link_SDL_dependency(*compiled),
+                 requires=['libusb'],
+                 compile_sources=lambda prepared, prepared_per_name: compile_SDL_codebase(prepared[0], describe_libusb_dependency(prepared_per_name['libusb'][0])))  # noqa: E501
 
-    SDL_codebase.add_dependency(get_libusb_dependency(Path.cwd()/'real_world_repos'))
-    SDL_codebase.generate_as_dependency(True)
+    pipeline.run()
@@ -4,6 +4,7 @@ import traceback
 from pathlib import Path
 
 from codebase import CodeBase, Dependency
+from variants import VariantMatrix
 
 
 def test_python_build_tool(library_is_C_plus_plus: bool,
@@ -45,20 +46,46 @@ def test_python_build_tool(library_is_C_plus_plus: bool,
         if clean_up_build_directories:
 
             if Arithmetic_library_codebase:
+                Arithmetic_library_codebase.remove_intermediate_directory()
                 if Arithmetic_library_codebase.build_directory.exists():
                     shutil.rmtree(Arithmetic_library_codebase.build_directory)
 
             if Arithmetic_codebase:
+                Arithmetic_codebase.remove_intermediate_directory()
                 if Arithmetic_codebase.build_directory.exists():
                     shutil.rmtree(Arithmetic_codebase.build_directory)
 
 
+def test_build_variant_matrix(library_is_C_plus_plus: bool,
+                              clean_up_build_directories: bool) -> None:
+
+    Arithmetic_library_matrix: VariantMatrix = \
+        VariantMatrix('Arithmetic',
+                      Path.cwd()/'example_repos'/f'C{'++' if library_is_C_plus_plus else '':s}_Library',
+                      build_configurations=['Debug', 'Release'],
+                      language_standards=['C++ 2017', 'C++ 2020'] if library_is_C_plus_plus else ['C 2011', 'C 2018'],
+                      linkages=[False, True])
+
+    try:
+        Arithmetic_library_matrix.build()
+
+    finally:
+        if clean_up_build_directories:
+            if Arithmetic_library_matrix.variants_directory.exists():
+                shutil.rmtree(Arithmetic_library_matrix.variants_directory)
+
+
 if (__name__ == '__main__'):
 
     library_is_C_plus_plus: bool = True
     library_is_dynamic: bool = False
     clean_up_build_directories: bool = True
+    build_variant_matrix: bool = False
 
-    test_python_build_tool(library_is_C_plus_plus,
-                           library_is_dynamic,
-                           clean_up_build_directories)
+    if build_variant_matrix:
+        test_build_variant_matrix(library_is_C_plus_plus,
+                                  clean_up_build_directories)
+    else:
+        test_python_build_tool(library_is_C_plus_plus,
+                               library_is_dynamic,
+                               clean_up_build_directories)
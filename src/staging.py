@@ -0,0 +1,113 @@
+import os
+import shutil
+import hashlib
+import platform
+from pathlib import Path
+
+
+# https://man7.org/linux/man-pages/man2/ioctl_ficlone.2.html
+FICLONE: int = 0x40049409
+
+STAGING_METHODS: list[str] = ['reflink', 'hardlink', 'symlink', 'copy']
+
+
+def hash_file(file_path: Path) -> str:
+
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1024*1024), b''):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def files_are_identical(source_file_path: Path,
+                        destination_file_path: Path) -> bool:
+
+    if not destination_file_path.exists():
+        return False
+
+    # A hardlink, a symlink, or the file itself share the same identity, so there is nothing to compare
+    if os.path.samefile(source_file_path, destination_file_path):
+        return True
+
+    # Only hash the contents when the cheaper size comparison cannot tell the files apart
+    if source_file_path.stat().st_size != destination_file_path.stat().st_size:
+        return False
+
+    return hash_file(source_file_path) == hash_file(destination_file_path)
+
+
+def _reflink(source_file_path: Path,
+             destination_file_path: Path) -> None:
+
+    # Copy-on-write clones are only implemented here for Linux filesystems which support them (e.g., Btrfs, XFS)
+    if platform.system() != 'Linux':
+        raise OSError('Reflinks are only supported on Linux')
+
+    import fcntl
+
+    with open(source_file_path, 'rb') as source_file, open(destination_file_path, 'wb') as destination_file:
+        fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+
+    shutil.copymode(source_file_path, destination_file_path)
+
+
+def stage_file(source_file_path: Path,
+               destination_file_path: Path,
+               allow_symlink: bool = True) -> str | None:
+
+    # Skip staging entirely if the destination already holds the same file
+    if files_are_identical(source_file_path, destination_file_path):
+        return None
+
+    # Stage into a temporary file next to the destination, so that the destination is only ever replaced whole
+    temporary_file_path: Path = destination_file_path.with_name(f'.{destination_file_path.name:s}.staging')
+
+    staging_functions = \
+        {'reflink': _reflink,
+         'hardlink': lambda source, destination: os.link(source, destination),
+         'symlink': lambda source, destination: os.symlink(source.resolve(), destination),
+         'copy': shutil.copy2}
+
+    for method in STAGING_METHODS:
+
+        if method == 'symlink' and not allow_symlink:
+            continue
+
+        if temporary_file_path.is_symlink() or temporary_file_path.exists():
+            Path.unlink(temporary_file_path)
+
+        try:
+            staging_functions[method](source_file_path, temporary_file_path)
+        except OSError:
+            # Fall back onto the next method (e.g., no reflink support, a different device, or no symlink privileges)
+            if method == STAGING_METHODS[-1]:
+                raise
+        else:
+            os.replace(temporary_file_path, destination_file_path)
+            return method
+
+    return None
+
+
+def stage_tree(source_directory: Path,
+               destination_directory: Path,
+               allow_symlink: bool = True) -> None:
+
+    # Symlinked directories are staged as the directories they point at, the same way as shutil.copytree does,
+    # except for one pointing back at a directory it is within, which would otherwise be staged forever
+    for root, directories, files in source_directory.walk(follow_symlinks=True):
+
+        for directory in directories:
+            if (root/directory).is_symlink() and root.resolve().is_relative_to((root/directory).resolve()):
+                raise ValueError(f'The following symlink points back at a directory it is within, so it cannot be staged: {str(root/directory):s}')  # noqa: E501
+
+        current_destination_directory: Path = destination_directory/root.relative_to(source_directory)
+        if not current_destination_directory.exists():
+            current_destination_directory.mkdir(parents=True)
+
+        for file in files:
+            stage_file(root/file,
+                       current_destination_directory/file,
+                       allow_symlink)
@@ -0,0 +1,241 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from build_plan import flag_arguments
+from modules import MODULE_FLAGS
+from profiling import PROFILING_FLAGS
+from intermediates import RAM_BACKED_FLAGS
+from compilation_constants import FLAGS_PER_BUILD_CONFIGURATION
+from compilation_constants import FLAGS_PER_DEBUG_INFORMATION_MODE
+from compilation_constants import C_PLUS_PLUS_LANGUAGE_STANDARDS
+from compilation_constants import C_LANGUAGE_STANDARDS
+from compilation_constants import FLAG_PER_WARNING
+from compilation_constants import FLAG_PER_MISCELLANEOUS_DECISION
+from compilation_constants import DEPENDENCY_TRACKING_FLAGS
+
+
+DEFAULT_TOOLCHAIN_CACHE_PATH: Path = Path(__file__).resolve().parent.parent/'toolchain_probes.json'
+
+PROBE_SOURCE_PER_UTILITY: dict[str, tuple[str, str]] = \
+    {'gcc': ('.c', 'int main(void) { return 0; }\n'),
+     'g++': ('.cpp', 'int main() { return 0; }\n')}
+
+PROBED_LINKING_FLAGS: list[str] = ['shared', 's', 'gz']
+
+# Every code base within a process shares the probe of its compiler, rather than reading the cache again
+_probe_lock: threading.Lock = threading.Lock()
+_probe_per_compiler: dict[str, 'ToolchainProbe'] = {}
+
+
+def probed_compilation_flag_groups(utility: str) -> list[list[str]]:
+
+    language_standard_flags: list[str] = \
+        [f'std=c++{standard:s}' for standard in C_PLUS_PLUS_LANGUAGE_STANDARDS] if utility == 'g++' else \
+        [f'std=c{year % 100:2d}' for year in C_LANGUAGE_STANDARDS]
+
+    # Every flag which the compilation settings of a code base can produce, other than defines and include directories
+    single_flags: list[str] = \
+        list(dict.fromkeys(language_standard_flags +
+                           [flag for flags in FLAGS_PER_BUILD_CONFIGURATION.values() for flag in flags] +
+                           [flag for flags in FLAGS_PER_DEBUG_INFORMATION_MODE.values() for flag in flags] +
+                           ['gdwarf-4'] +
+                           [f'W{flag:s}' for flag in FLAG_PER_WARNING.values()] +
+                           list(FLAG_PER_MISCELLANEOUS_DECISION.values()) +
+                           PROFILING_FLAGS +
+                           RAM_BACKED_FLAGS +
+                           (MODULE_FLAGS if utility == 'g++' else [])))
+
+    # The depfile flags are only valid together (e.g., '-MP' on its own is an error), so they are probed as one
+    return [[flag] for flag in single_flags] + [DEPENDENCY_TRACKING_FLAGS]
+
+
+def probed_compilation_flags(utility: str) -> list[str]:
+    return [flag for flag_group in probed_compilation_flag_groups(utility) for flag in flag_group]
+
+
+class ToolchainProbe:
+
+    def __init__(self,
+                 utility: str,
+                 compiler_path: Path,
+                 modification_time: int,
+                 version: str,
+                 support_per_compilation_flag: dict[str, bool],
+                 support_per_linking_flag: dict[str, bool]) -> None:
+
+        self._utility: str = utility
+        self._compiler_path: Path = compiler_path
+        self._modification_time: int = modification_time
+        self._version: str = version
+        self._support_per_compilation_flag: dict[str, bool] = support_per_compilation_flag
+        self._support_per_linking_flag: dict[str, bool] = support_per_linking_flag
+
+    @property
+    def utility(self) -> str:
+        return self._utility
+
+    @property
+    def compiler_path(self) -> Path:
+        return self._compiler_path
+
+    @property
+    def modification_time(self) -> int:
+        return self._modification_time
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def support_per_compilation_flag(self) -> dict[str, bool]:
+        return self._support_per_compilation_flag
+
+    @property
+    def support_per_linking_flag(self) -> dict[str, bool]:
+        return self._support_per_linking_flag
+
+    def unsupported_compilation_flags(self,
+                                      flags: list[str]) -> list[str]:
+
+        # Flags which were never probed (e.g., defines and include directories) are given the benefit of the doubt
+        return [flag for flag in flags if not self._support_per_compilation_flag.get(flag, True)]
+
+    def unsupported_linking_flags(self,
+                                  flags: list[str]) -> list[str]:
+        return [flag for flag in flags if not self._support_per_linking_flag.get(flag, True)]
+
+    def to_json(self) -> dict:
+        return {'utility': self._utility,
+                'compiler_path': str(self._compiler_path),
+                'modification_time': self._modification_time,
+                'version': self._version,
+                'compilation_flags': self._support_per_compilation_flag,
+                'linking_flags': self._support_per_linking_flag}
+
+    @staticmethod
+    def from_json(probe: dict) -> 'ToolchainProbe':
+        return ToolchainProbe(probe['utility'],
+                              Path(probe['compiler_path']),
+                              probe['modification_time'],
+                              probe['version'],
+                              probe['compilation_flags'],
+                              probe['linking_flags'])
+
+
+def _flag_is_supported(command: list[str],
+                       working_directory: Path) -> bool:
+
+    results: subprocess.CompletedProcess[bytes] = \
+        subprocess.run(command,
+                       stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL,
+                       cwd=working_directory)
+
+    return results.returncode == 0
+
+
+def _run_probes(utility: str,
+                compiler_path: Path,
+                modification_time: int) -> ToolchainProbe:
+
+    version_results: subprocess.CompletedProcess[bytes] = \
+        subprocess.run([str(compiler_path), '--version'],
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE)
+    version: str = version_results.stdout.decode('utf-8', errors='replace').split('\n')[0].strip()
+
+    source_extension, source_code = PROBE_SOURCE_PER_UTILITY[utility]
+    compilation_flag_groups: list[list[str]] = probed_compilation_flag_groups(utility)
+
+    with tempfile.TemporaryDirectory() as probe_directory:
+
+        source_file_name: str = f'probe{source_extension:s}'
+        (Path(probe_directory)/source_file_name).write_text(source_code)
+
+        # A flag only counts as supported if it compiles (or links) without so much as a warning,
+        # since a flag meant for another language is merely warned about
+        compilation_commands: list[list[str]] = \
+            [[str(compiler_path), '-c', source_file_name, '-o', f'compile_{index:d}.o', '-Werror'] + flag_arguments(flag_group) for index, flag_group in enumerate(compilation_flag_groups)]  # noqa: E501
+        linking_commands: list[list[str]] = \
+            [[str(compiler_path), source_file_name, '-o', f'link_{index:d}.out', '-Werror'] + flag_arguments([flag]) for index, flag in enumerate(PROBED_LINKING_FLAGS)]  # noqa: E501
+
+        # Each probe is its own child process, so they can all run at once
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            supported: list[bool] = \
+                list(executor.map(lambda command: _flag_is_supported(command, Path(probe_directory)), compilation_commands + linking_commands))  # noqa: E501
+
+    return ToolchainProbe(utility,
+                          compiler_path,
+                          modification_time,
+                          version,
+                          {flag: flag_group_supported for flag_group, flag_group_supported in zip(compilation_flag_groups, supported) for flag in flag_group},  # noqa: E501
+                          dict(zip(PROBED_LINKING_FLAGS, supported[len(compilation_flag_groups):])))
+
+
+def probe_toolchain(utility: str,
+                    cache_path: Path | None = DEFAULT_TOOLCHAIN_CACHE_PATH,
+                    cached_only: bool = False) -> ToolchainProbe | None:
+
+    # A compiler is identified by where it lives and when it was last modified, where its version is kept alongside
+    # (when only looking up a cached probe, a compiler which cannot be found simply has none)
+    found_compiler_path: str | None = shutil.which(utility)
+    if not found_compiler_path:
+        if cached_only:
+            return None
+        raise ValueError(f'The \'{utility:s}\' compiler could not be found, please make sure it is installed and on the PATH')  # noqa: E501
+
+    compiler_path: Path = Path(found_compiler_path).resolve()
+    modification_time: int = compiler_path.stat().st_mtime_ns
+    compiler_key: str = f'{str(compiler_path):s}:{modification_time:d}'
+
+    with _probe_lock:
+
+        # Only probe again if the compiler changed, or if there are flags which it has never been probed for
+        probe: ToolchainProbe | None = _probe_per_compiler.get(compiler_key)
+
+        cached_probes: dict[str, dict] = {}
+        if probe is None and cache_path and cache_path.exists():
+            try:
+                cached_probes = json.loads(cache_path.read_text())
+            except ValueError:
+                cached_probes = {}
+            if compiler_key in cached_probes:
+                probe = ToolchainProbe.from_json(cached_probes[compiler_key])
+
+        if probe is None or not set(probed_compilation_flags(utility)) <= set(probe.support_per_compilation_flag.keys()):  # noqa: E501
+
+            if cached_only:
+                return None
+
+            probe = _run_probes(utility,
+                                compiler_path,
+                                modification_time)
+
+            # Write the whole cache to a temporary file first, so that concurrent builds never read half of it
+            if cache_path:
+                cached_probes[compiler_key] = probe.to_json()
+                temporary_cache_path: Path = cache_path.with_name(f'{cache_path.name:s}.{os.getpid():d}.tmp')
+                temporary_cache_path.write_text(json.dumps(cached_probes, indent=4, sort_keys=True))
+                os.replace(temporary_cache_path, cache_path)
+
+        _probe_per_compiler[compiler_key] = probe
+
+    return probe
+
+
+if (__name__ == '__main__'):
+
+    for utility in PROBE_SOURCE_PER_UTILITY:
+
+        probe: ToolchainProbe = probe_toolchain(utility)
+        unsupported_flags: list[str] = \
+            [f'-{flag:s}' for flag, supported in probe.support_per_compilation_flag.items() if not supported] + \
+            [f'-{flag:s} (linking)' for flag, supported in probe.support_per_linking_flag.items() if not supported]
+
+        print(f'\n{utility:s}: {probe.version:s} ({str(probe.compiler_path):s})\n\tUnsupported flags: {', '.join(unsupported_flags) if unsupported_flags else 'None':s}')  # noqa: E501
@@ -0,0 +1,270 @@
+import os
+import time
+import shutil
+import itertools
+import traceback
+from pathlib import Path
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from codebase import CodeBase, Dependency
+from object_cache import ObjectCache
+from staging import stage_file
+from executable_tests import TestCase, TestResult, TestRunner
+from compilation_constants import FLAGS_PER_BUILD_CONFIGURATION
+from compilation_constants import FLAG_PER_WARNING
+from compilation_constants import FLAG_PER_MISCELLANEOUS_DECISION
+
+
+class BuildVariant:
+
+    def __init__(self,
+                 build_configuration: str,
+                 language_standard: str,
+                 is_dynamic: bool | None,
+                 preprocessor_variables: list[str]) -> None:
+
+        self._build_configuration: str = build_configuration
+        self._language_standard: str = language_standard
+        self._is_dynamic: bool | None = is_dynamic
+        self._preprocessor_variables: list[str] = preprocessor_variables
+
+    def __str__(self) -> str:
+        return ', '.join([self._build_configuration,
+                          self._language_standard,
+                          self.linkage,
+                          ' '.join(self._preprocessor_variables) if self._preprocessor_variables else 'No Preprocessor Variables'])  # noqa: E501
+
+    @property
+    def build_configuration(self) -> str:
+        return self._build_configuration
+
+    @property
+    def language_standard(self) -> str:
+        return self._language_standard
+
+    @property
+    def is_dynamic(self) -> bool | None:
+        return self._is_dynamic
+
+    @property
+    def preprocessor_variables(self) -> list[str]:
+        return self._preprocessor_variables
+
+    @property
+    def linkage(self) -> str:
+        return 'Executable' if self._is_dynamic is None else ('Dynamic' if self._is_dynamic else 'Static')
+
+    @property
+    def label(self) -> str:
+
+        # The label is used as the name of the isolated Build directory of the variant
+        return '_'.join([self._build_configuration,
+                         self._language_standard.replace(' ', '').replace('+', 'p'),
+                         self.linkage,
+                         '-'.join(self._preprocessor_variables) if self._preprocessor_variables else 'NoDefines'])
+
+
+class VariantResult:
+
+    def __init__(self,
+                 variant: BuildVariant,
+                 build_directory: Path,
+                 duration: float,
+                 dependency: Dependency | None = None,
+                 error: str | None = None) -> None:
+
+        self._variant: BuildVariant = variant
+        self._build_directory: Path = build_directory
+        self._duration: float = duration
+        self._dependency: Dependency | None = dependency
+        self._error: str | None = error
+
+    @property
+    def variant(self) -> BuildVariant:
+        return self._variant
+
+    @property
+    def build_directory(self) -> Path:
+        return self._build_directory
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def dependency(self) -> Dependency | None:
+        return self._dependency
+
+    @property
+    def error(self) -> str | None:
+        return self._error
+
+    @property
+    def succeeded(self) -> bool:
+        return self._error is None
+
+
+class VariantMatrix:
+
+    def __init__(self,
+                 name: str,
+                 repository_directory: Path,
+                 build_configurations: list[str] = [list(FLAGS_PER_BUILD_CONFIGURATION.keys())[0]],
+                 language_standards: list[str] = ['C++ 2020'],
+                 linkages: list[bool | None] = [None],
+                 preprocessor_variable_sets: list[list[str]] = [[]],
+                 warnings: str | list[str] = list(FLAG_PER_WARNING.keys()),
+                 miscellaneous: str | list[str] = list(FLAG_PER_MISCELLANEOUS_DECISION.keys()),
+                 dependencies: list[Dependency] = [],
+                 jobs: int | None = None) -> None:
+
+        self._name: str = name
+        self._repository_directory: Path = repository_directory
+        self._warnings: str | list[str] = warnings
+        self._miscellaneous: str | list[str] = miscellaneous
+        self._dependencies: list[Dependency] = dependencies
+
+        # Every variant gets its own Build directory, so that all of the variants can coexist
+        self._variants_directory: Path = self._repository_directory/'build'/'variants'
+
+        # The job budget is shared between all of the variants being built at once
+        self._jobs: int = jobs if jobs else (os.cpu_count() or 1)
+        if self._jobs < 1:
+            raise ValueError(f'The \'{self._name:s}\' variant matrix needs a job budget of at least 1')
+
+        # Every combination of the axes is a variant
+        self._variants: list[BuildVariant] = \
+            [BuildVariant(build_configuration,
+                          language_standard,
+                          is_dynamic,
+                          preprocessor_variables) for build_configuration, language_standard, is_dynamic, preprocessor_variables in itertools.product(build_configurations,  # noqa: E501
+                                                                                                                                                    language_standards,  # noqa: E501
+                                                                                                                                                    linkages,  # noqa: E501
+                                                                                                                                                    preprocessor_variable_sets)]  # noqa: E501
+
+        if len(set([variant.label for variant in self._variants])) != len(self._variants):
+            raise ValueError(f'The axes of the \'{self._name:s}\' variant matrix contain duplicate values')
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def variants(self) -> list[BuildVariant]:
+        return self._variants
+
+    @property
+    def variants_directory(self) -> Path:
+        return self._variants_directory
+
+    def _build_variant(self,
+                       variant: BuildVariant,
+                       object_cache: ObjectCache,
+                       job_pool: Executor) -> VariantResult:
+
+        build_directory: Path = self._variants_directory/variant.label
+        dependency: Dependency | None = None
+        error: str | None = None
+
+        start_time: float = time.perf_counter()
+
+        try:
+
+            codebase: CodeBase = \
+                CodeBase(self._name,
+                         self._repository_directory,
+                         build_configuration=variant.build_configuration,
+                         language_standard=variant.language_standard,
+                         warnings=list(self._warnings) if isinstance(self._warnings, list) else self._warnings,
+                         miscellaneous=list(self._miscellaneous) if isinstance(self._miscellaneous, list) else self._miscellaneous,  # noqa: E501
+                         preprocessor_variables=variant.preprocessor_variables,
+                         build_directory=build_directory,
+                         object_cache=object_cache,
+                         job_pool=job_pool)
+
+            for matrix_dependency in self._dependencies:
+                codebase.add_dependency(matrix_dependency)
+
+            if variant.is_dynamic is None:
+                codebase.generate_as_executable()
+            else:
+                dependency = codebase.generate_as_dependency(variant.is_dynamic)
+
+        except Exception:
+            error = traceback.format_exc()
+
+        return VariantResult(variant,
+                             build_directory,
+                             time.perf_counter() - start_time,
+                             dependency,
+                             error)
+
+    def build(self) -> list[VariantResult]:
+
+        # The object cache only lives as long as this build, so start it from a clean slate
+        object_cache_directory: Path = self._variants_directory/'objects'
+        if object_cache_directory.exists():
+            shutil.rmtree(object_cache_directory)
+        object_cache: ObjectCache = ObjectCache(object_cache_directory)
+
+        # Every variant is built at once, where the compile (and link) actions of all of them are fed into the same pool,
+        # so that the job budget is shared between the variants rather than split up among them
+        with ThreadPoolExecutor(max_workers=self._jobs) as job_pool:
+            with ThreadPoolExecutor(max_workers=len(self._variants)) as executor:
+                results: list[VariantResult] = \
+                    list(executor.map(lambda variant: self._build_variant(variant, object_cache, job_pool), self._variants))  # noqa: E501
+
+        print(self._format_results(results, object_cache))
+
+        return results
+
+    def test(self,
+             argument_sets: list[list[str]] = [[]],
+             timeout: float = 60.0,
+             rerun_all: bool = False) -> list[TestResult]:
+
+        dynamic_dependencies: list[Dependency] = \
+            [dependency for dependency in self._dependencies if not dependency.is_header_only and dependency.is_dynamic]
+
+        # Stage any .dll/.so files next to every executable for testing (once per Binary directory), since that is
+        # where Windows searches for them
+        test_cases: list[TestCase] = []
+        staged_library_paths_per_directory: dict[Path, list[Path]] = {}
+        for executable_path in sorted(self._variants_directory.rglob('*.exe')):
+
+            if executable_path.parent not in staged_library_paths_per_directory:
+                staged_library_paths_per_directory[executable_path.parent] = []
+                for dependency in dynamic_dependencies:
+                    staged_library_paths_per_directory[executable_path.parent].append(executable_path.parent/dependency.library_path.name)  # noqa: E501
+                    stage_file(dependency.library_path,
+                               staged_library_paths_per_directory[executable_path.parent][-1])
+
+            test_cases += [TestCase(executable_path,
+                                    arguments,
+                                    timeout,
+                                    staged_library_paths_per_directory[executable_path.parent]) for arguments in argument_sets]  # noqa: E501
+
+        # The executables of every variant are tested at once, sharing the same job budget as the builds
+        test_runner: TestRunner = \
+            TestRunner(test_cases,
+                       self._variants_directory/'test_results.json',
+                       self._jobs)
+
+        return test_runner.run(rerun_all)
+
+    def _format_results(self,
+                        results: list[VariantResult],
+                        object_cache: ObjectCache) -> str:
+
+        title: str = f'\'{self._name:s}\' Variant Matrix Results'
+        max_variant_length: int = max([len(str(result.variant)) for result in results])
+
+        formatted_results: list[str] = \
+            [f'{str(result.variant):>{max_variant_length:d}s}: {'Succesful' if result.succeeded else 'Failure':s} ({result.duration:.3f} s)' for result in results]  # noqa: E501
+        formatted_results.append(f'\nReused object files: {object_cache.hits:d} of {object_cache.hits + object_cache.misses:d}')  # noqa: E501
+
+        for result in results:
+            if not result.succeeded:
+                formatted_results.append(f'\n{str(result.variant):s}:\n{result.error:s}')
+
+        return f'\n{title:s}\n{'':{'-':s}>{len(title):d}s}\n{'\n'.join(formatted_results):s}\n'  # noqa: E231
@@ -0,0 +1,365 @@
+import os
+import time
+import ctypes
+import select
+import struct
+import platform
+import traceback
+from pathlib import Path
+
+from codebase import CodeBase
+from depfile import read_depfile
+from build_plan import BuildAction, BuildPlan
+
+
+# https://man7.org/linux/man-pages/man7/inotify.7.html
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+INOTIFY_WATCH_MASK: int = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT_HEADER_FORMAT: str = 'iIII'
+
+
+class InotifyWatcher:
+
+    def __init__(self,
+                 directories: list[Path]) -> None:
+
+        self._libc: ctypes.CDLL = ctypes.CDLL(None, use_errno=True)
+
+        self._file_descriptor: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), 'Could not initialize inotify')
+
+        # inotify watches are not recursive, so every sub-directory needs a watch of its own
+        self._directory_per_watch_descriptor: dict[int, Path] = {}
+        for directory in directories:
+            self._watch_tree(directory)
+
+    def _watch_tree(self,
+                    directory: Path) -> list[Path]:
+
+        file_paths: list[Path] = []
+
+        for root, _, files in directory.walk():
+
+            watch_descriptor: int = \
+                self._libc.inotify_add_watch(self._file_descriptor, os.fsencode(root), INOTIFY_WATCH_MASK)
+            if watch_descriptor < 0:
+                raise OSError(ctypes.get_errno(), f'Could not watch the following directory: {str(root):s}')
+
+            self._directory_per_watch_descriptor[watch_descriptor] = root
+            file_paths += [root/file for file in files]
+
+        return file_paths
+
+    def wait_for_changes(self,
+                         timeout: float) -> set[Path]:
+
+        changed_paths: set[Path] = set()
+
+        readable, _, _ = select.select([self._file_descriptor], [], [], timeout)
+        if not readable:
+            return changed_paths
+
+        header_size: int = struct.calcsize(INOTIFY_EVENT_HEADER_FORMAT)
+
+        while True:
+
+            try:
+                events: bytes = os.read(self._file_descriptor, 64*1024)
+            except BlockingIOError:
+                break
+
+            offset: int = 0
+            while offset < len(events):
+
+                watch_descriptor, mask, _, name_length = \
+                    struct.unpack_from(INOTIFY_EVENT_HEADER_FORMAT, events, offset)
+                name: bytes = events[offset + header_size:offset + header_size + name_length].rstrip(b'\0')
+                offset += header_size + name_length
+
+                if mask & IN_IGNORED:
+                    self._directory_per_watch_descriptor.pop(watch_descriptor, None)
+                    continue
+
+                directory: Path | None = self._directory_per_watch_descriptor.get(watch_descriptor)
+                if directory is None or not name:
+                    continue
+
+                changed_path: Path = directory/os.fsdecode(name)
+
+                # A directory that was created or moved in must be watched too, and everything inside it is new
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed_paths |= set(self._watch_tree(changed_path))
+                else:
+                    changed_paths.add(changed_path)
+
+        return changed_paths
+
+    def close(self) -> None:
+        os.close(self._file_descriptor)
+
+
+class PollingWatcher:
+
+    def __init__(self,
+                 directories: list[Path]) -> None:
+
+        self._directories: list[Path] = directories
+        self._modification_time_per_file: dict[Path, int] = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, int]:
+
+        modification_time_per_file: dict[Path, int] = {}
+        for directory in self._directories:
+            for root, _, files in directory.walk():
+                for file in files:
+                    modification_time_per_file[root/file] = (root/file).stat().st_mtime_ns
+
+        return modification_time_per_file
+
+    def wait_for_changes(self,
+                         timeout: float) -> set[Path]:
+
+        time.sleep(timeout)
+
+        previous_snapshot: dict[Path, int] = self._modification_time_per_file
+        self._modification_time_per_file = self._snapshot()
+
+        return set([file_path for file_path in previous_snapshot.keys() | self._modification_time_per_file.keys()
+                    if previous_snapshot.get(file_path) != self._modification_time_per_file.get(file_path)])
+
+    def close(self) -> None:
+        pass
+
+
+def create_file_watcher(directories: list[Path]) -> InotifyWatcher | PollingWatcher:
+
+    # Filesystem notifications are only implemented for Linux, every other platform falls back to polling
+    match platform.system():
+        case 'Linux':
+            return InotifyWatcher(directories)
+        case _:
+            return PollingWatcher(directories)
+
+
+class BuildServer:
+
+    def __init__(self,
+                 codebase: CodeBase,
+                 is_dynamic: bool | None = None,
+                 test_after_build: bool = False,
+                 poll_interval: float = 0.5,
+                 debounce_interval: float = 0.1) -> None:
+
+        if not codebase.incremental:
+            raise ValueError(f'The \'{codebase.name:s}\' code base must be built incrementally to be watched, please instantiate it with incremental=True')  # noqa: E501
+
+        if test_after_build and is_dynamic is not None:
+            raise ValueError(f'The \'{codebase.name:s}\' code base is being built as a library, so there is no executable to test after each build')  # noqa: E501
+
+        self._codebase: CodeBase = codebase
+        self._is_dynamic: bool | None = is_dynamic
+        self._test_after_build: bool = test_after_build
+        self._poll_interval: float = poll_interval
+        self._debounce_interval: float = debounce_interval
+
+        # The build plan and the depfile graph are kept in memory for the lifetime of the server
+        self._build_plan: BuildPlan | None = None
+        self._compile_action_per_source: dict[Path, BuildAction] = {}
+        self._prerequisites_per_source: dict[Path, set[Path]] = {}
+        self._failed_source_file_paths: set[Path] = set()
+
+        # Watch the Source directory along with the Include directory of the code base and of every dependency
+        self._watched_directories: list[Path] = \
+            [codebase.source_directory.resolve()] + \
+            list(dict.fromkeys([dependency.include_directory.resolve() for dependency in codebase.dependencies]))
+
+    @property
+    def watched_directories(self) -> list[Path]:
+        return self._watched_directories
+
+    def _read_prerequisites(self,
+                            source_file_path: Path) -> None:
+
+        depfile_path: Path = self._compile_action_per_source[source_file_path].outputs[0].with_suffix('.d')
+        self._prerequisites_per_source[source_file_path] = \
+            set([prerequisite_path.resolve() for prerequisite_path in read_depfile(depfile_path, self._codebase.repository_directory)]) if depfile_path.exists() else set()  # noqa: E501
+
+    def _plan(self) -> None:
+
+        # Planning walks the Source directory, so it only happens initially and whenever source files come or go
+        # (or on every rebuild if using modules, since any edit may change which modules a source file imports)
+        self._build_plan = self._codebase.plan(self._is_dynamic)
+        self._compile_action_per_source = \
+            {compile_action.source_file_path.resolve(): compile_action for compile_action in self._build_plan.compile_actions}  # noqa: E501
+
+    def _link(self) -> None:
+
+        self._codebase.link(self._build_plan, self._is_dynamic)
+
+        if self._test_after_build:
+            self._codebase.test_executable()
+
+    def _object_file_is_out_of_date(self,
+                                    source_file_path: Path) -> bool:
+
+        # A source file which failed to compile is left without an object file, or with one older than its prerequisites
+        object_file_path: Path = self._compile_action_per_source[source_file_path].outputs[0]
+        if not object_file_path.exists():
+            return True
+
+        modification_time: int = object_file_path.stat().st_mtime_ns
+        return any([not prerequisite_path.exists() or prerequisite_path.stat().st_mtime_ns > modification_time for prerequisite_path in self._prerequisites_per_source[source_file_path] | {source_file_path}])  # noqa: E501
+
+    def initial_build(self) -> None:
+
+        self._codebase.start_build_record()
+        succeeded: bool = False
+
+        try:
+
+            # Pay for the full tree walk and the depfile parsing exactly once
+            self._plan()
+            try:
+                self._codebase.compile(self._build_plan)
+            except Exception:
+                print(traceback.format_exc())
+
+            for source_file_path in self._compile_action_per_source:
+                self._read_prerequisites(source_file_path)
+
+            # Whichever source files did not compile are compiled again on the next change, the same as in any rebuild
+            self._failed_source_file_paths = \
+                set([source_file_path for source_file_path in self._compile_action_per_source if self._object_file_is_out_of_date(source_file_path)])  # noqa: E501
+
+            if not self._failed_source_file_paths:
+                self._link()
+                succeeded = True
+
+        finally:
+            self._codebase.finish_build_record(succeeded)
+
+    def rebuild(self,
+                changed_paths: set[Path]) -> None:
+
+        # A server which never got as far as a build plan (e.g., a module was imported but never exported) starts over
+        if self._build_plan is None:
+            self.initial_build()
+            return
+
+        # Every rebuild is recorded as a build of its own, which only ever compiles what changed
+        self._codebase.start_build_record(is_partial=True)
+        succeeded: bool = False
+
+        try:
+            self._rebuild(changed_paths)
+            succeeded = not self._failed_source_file_paths
+
+        finally:
+            self._codebase.finish_build_record(succeeded)
+
+    def _rebuild(self,
+                 changed_paths: set[Path]) -> None:
+
+        source_file_paths_to_compile: set[Path] = set(self._failed_source_file_paths)
+        source_files_came_or_went: bool = False
+
+        for changed_path in [changed_path.resolve() for changed_path in changed_paths]:
+
+            # Keep the source index up to date with any source files that were added or removed
+            if changed_path.is_relative_to(self._watched_directories[0]) and \
+               changed_path.suffix in self._codebase.source_code_extensions:
+
+                if changed_path.exists():
+                    source_files_came_or_went |= changed_path not in self._compile_action_per_source
+                    source_file_paths_to_compile.add(changed_path)
+
+                elif changed_path in self._compile_action_per_source:
+                    self._codebase.remove_object_files([self._compile_action_per_source[changed_path].outputs[0]])
+                    self._prerequisites_per_source.pop(changed_path, None)
+                    source_files_came_or_went = True
+
+            # Recompile every source file whose depfile lists the changed file as a prerequisite
+            source_file_paths_to_compile |= \
+                set([source_file_path for source_file_path, prerequisites in self._prerequisites_per_source.items() if changed_path in prerequisites])  # noqa: E501
+
+        self._failed_source_file_paths = set()
+
+        # With modules, a changed module interface also changes the compiled interface its importers are built against,
+        # so the whole plan is brought up to date instead, where only what is out of date is actually compiled
+        # (and any edit may change which modules a source file imports, so the plan is made again every time)
+        if self._codebase.modules:
+            if source_file_paths_to_compile or source_files_came_or_went:
+                try:
+                    self._plan()
+                    self._codebase.compile(self._build_plan)
+                except Exception:
+                    print(traceback.format_exc())
+                    self._failed_source_file_paths = source_file_paths_to_compile or set(self._compile_action_per_source)
+                else:
+                    for source_file_path in self._compile_action_per_source:
+                        self._read_prerequisites(source_file_path)
+
+        else:
+            if source_files_came_or_went:
+                self._plan()
+            source_file_paths_to_compile &= self._compile_action_per_source.keys()
+
+            for source_file_path in sorted(source_file_paths_to_compile):
+                try:
+                    self._codebase.compile(self._build_plan, [source_file_path])
+                except Exception:
+                    print(traceback.format_exc())
+                    self._failed_source_file_paths.add(source_file_path)
+                else:
+                    self._read_prerequisites(source_file_path)
+
+        # Only relink once every translation unit compiles again
+        if (source_file_paths_to_compile or source_files_came_or_went) and not self._failed_source_file_paths:
+            self._link()
+
+    def serve(self) -> None:
+
+        # Start watching before the initial build, so that nothing saved while it runs goes unnoticed
+        watcher: InotifyWatcher | PollingWatcher = create_file_watcher(self._watched_directories)
+
+        try:
+
+            # A code base which does not build at first is simply waited on, the same as after any failed rebuild
+            try:
+                self.initial_build()
+            except Exception:
+                print(traceback.format_exc())
+
+            print(f'\nWatching for changes in:\n{'\n'.join([f'\t{str(directory):s}' for directory in self._watched_directories]):s}\n')  # noqa: E501
+
+            while True:
+
+                changed_paths: set[Path] = watcher.wait_for_changes(self._poll_interval)
+                if not changed_paths:
+                    continue
+
+                # Editors tend to save a file in several steps, so gather changes until they settle down
+                while True:
+                    further_changed_paths: set[Path] = watcher.wait_for_changes(self._debounce_interval)
+                    if not further_changed_paths:
+                        break
+                    changed_paths |= further_changed_paths
+
+                try:
+                    self.rebuild(changed_paths)
+                except Exception:
+                    print(traceback.format_exc())
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            watcher.close()